@@ -0,0 +1,52 @@
+import time
+
+from bs4 import BeautifulSoup, Comment
+
+from html_fragments import find_comment, find_table, page_from_dump
+
+FIXTURE = "hopkins_html_comments_dump.txt"
+RUNS = 50
+
+
+def old_way(html):
+    """What the scrapers used to do: parse everything, walk every Comment, re-parse the match."""
+    soup = BeautifulSoup(html, 'html.parser')
+    comments = soup.find_all(string=lambda text: isinstance(text, Comment))
+    recognition = next((c for c in comments if "Recognition" in c), None)
+    table = None
+    for comment in comments:
+        if 'id="fantasy"' in comment:
+            table = BeautifulSoup(comment, 'html.parser').find('table', id='fantasy')
+            break
+    return recognition, table
+
+
+def new_way(html):
+    """Slice the two fragments out of the raw string and only parse the table."""
+    recognition = find_comment(html, "Recognition")
+    table = BeautifulSoup(find_table(html, 'fantasy'), 'html.parser').find('table')
+    return recognition, table
+
+
+def bench(fn, html):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        result = fn(html)
+    return (time.perf_counter() - start) / RUNS, result
+
+
+if __name__ == "__main__":
+    with open(FIXTURE) as f:
+        html = page_from_dump(f.read())
+    print(f"📄 Fixture: {FIXTURE} ({len(html) / 1024:.0f} KB as HTML)")
+
+    old_t, (old_rec, old_table) = bench(old_way, html)
+    new_t, (new_rec, new_table) = bench(new_way, html)
+
+    # Both paths have to find the same things or the speedup means nothing
+    assert old_rec.strip() == new_rec.strip(), "Recognition text differs"
+    assert len(old_table.find_all('tr')) == len(new_table.find_all('tr')), "Fantasy table differs"
+
+    print(f"🐢 full-DOM comment scan: {old_t * 1000:.2f} ms/page")
+    print(f"⚡ raw fragment locator:  {new_t * 1000:.2f} ms/page")
+    print(f"✅ {old_t / new_t:.1f}x faster, same fragments")
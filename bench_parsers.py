@@ -0,0 +1,63 @@
+import time
+
+from html_fragments import find_table, page_from_dump
+from html_parser import available, get_backend
+from player_page import PlayerPage, extract
+
+FIXTURE = "hopkins_html_comments_dump.txt"
+# A full player page with the receiving table, shipped live and inside <!-- -->
+PLAYER_PAGES = ("fixtures/players/H/HopkDe00.htm", "fixtures/players/H/HopkDe00.commented.htm")
+RUNS = 50
+
+
+def bench(fn):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fn()
+    return (time.perf_counter() - start) / RUNS
+
+
+if __name__ == "__main__":
+    with open(FIXTURE) as f:
+        html = page_from_dump(f.read())
+    fragment = find_table(html, 'fantasy')
+
+    names = available()
+    print(f"📄 Fixture: {FIXTURE}, backends installed: {', '.join(names)}")
+    if len(names) < 2:
+        print("⚠️ Fewer than two backends installed, so nothing below is compared (test_parser_backends.py fails)")
+
+    # === Equivalence: every backend has to pull out exactly the same data ===
+    results = {}
+    for name in names:
+        page = PlayerPage('HopkDe00', html, parser=name)
+        results[name] = (page.table_rows('fantasy'), extract(page))
+
+    baseline = names[0]
+    for name in names[1:]:
+        assert results[name] == results[baseline], f"{name} disagrees with {baseline}"
+    print(f"✅ {len(names)} backends agree on {len(results[baseline][0])} rows and the extracted record")
+
+    # The dump has no receiving table, so the career stats above are all None; these pages do
+    pages = {}
+    for path in PLAYER_PAGES:
+        with open(path) as f:
+            pages[path] = f.read()
+    results = {}
+    for name in names:
+        for path, page_html in pages.items():
+            page = PlayerPage('HopkDe00', page_html, parser=name)
+            results[name, path] = (page.table_rows('receiving_and_rushing'), extract(page))
+
+    baseline = results[names[0], PLAYER_PAGES[0]]
+    assert baseline[1]['Games_Played'] and baseline[1]['Receiving_Yards'], "fixture lost its receiving table"
+    for key, result in results.items():
+        assert result == baseline, f"{key[0]} on {key[1]} disagrees with {names[0]} on {PLAYER_PAGES[0]}"
+    print(f"✅ {len(names)} backends agree on {len(baseline[0])} receiving rows and "
+          f"{baseline[1]['Receiving_Yards']} career yards, commented out or not")
+
+    # === Speed ===
+    for name in names:
+        backend = get_backend(name)
+        t = bench(lambda: backend.table_rows(fragment))
+        print(f"⏱️ {name:12s} {t * 1000:.3f} ms/table")
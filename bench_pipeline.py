@@ -0,0 +1,232 @@
+import argparse
+import atexit
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+# Everything the end-to-end run touches goes to a throwaway cache and fetch
+# state, with the rate limit off. Has to be set before the modules read it.
+_TMP = tempfile.mkdtemp(prefix="wr_bench_")
+atexit.register(shutil.rmtree, _TMP, ignore_errors=True)
+os.environ["WR_CACHE_DIR"] = os.path.join(_TMP, "cache")
+os.environ["WR_FETCH_STATE"] = os.path.join(_TMP, "fetch_state.json")
+os.environ["WR_MAX_RATE"] = "1e9"
+os.environ["WR_BURST"] = "1000"
+
+import numpy as np
+import pandas as pd
+
+import fetcher
+import page_archive
+import page_cache
+import scoring
+from draft_ingest import parse_draft
+from html_fragments import find_table, page_from_dump
+from html_parser import available, get_backend
+from parse_stage import iter_tasks, load_task, parse_one
+from player_page import EXTRACTORS, PlayerPage, extract
+from stub_server import StubServer
+
+# === Offline benchmark suite ===
+# Times each stage on recorded pages only: table parse per backend, each
+# extractor, the draft page parse, end to end (fetch from a local stub server -> cache -> parse),
+# single-page reads from a page archive and the scorer on synthetic rows. Every run is appended to RESULTS and compared
+# with the previous one, so a slowdown shows up as a regression.
+
+FIXTURE = "hopkins_html_comments_dump.txt"
+FIXTURES = "fixtures/players"              # full player pages, receiving table live and commented out
+DRAFT_FIXTURE = "fixtures/years/2013/draft.htm"
+RESULTS = "bench_results.jsonl"
+REGRESSION = 1.10      # flag anything 10% slower than last time
+SCORER_ROWS = (1_000, 100_000, 1_000_000)
+E2E_PLAYERS = 200
+
+
+def timed(fn, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs
+
+
+def fixture_pages(fixtures=None):
+    """(player_id, html) for the Hopkins dump, the pages in FIXTURES and every recorded page in `fixtures`."""
+    with open(FIXTURE) as f:
+        pages = [('HopkDe00', page_from_dump(f.read()))]
+    for source in dict.fromkeys(filter(None, (FIXTURES, fixtures))):
+        for task in iter_tasks(source):
+            name, html = load_task(task)
+            pages.append((os.path.basename(name).split('.')[0], html))
+    return pages
+
+
+def stats_tables(html):
+    """Every table fragment on a page (commented out or not)."""
+    ids = dict.fromkeys(re.findall(r'<table[^>]*\bid="([^"]+)"', html))
+    return [fragment for fragment in (find_table(html, table_id) for table_id in ids) if fragment]
+
+
+def bench_parse(pages, runs):
+    """ms per page to turn every table on it into rows, for each installed backend."""
+    fragments = [stats_tables(html) for _, html in pages]
+    out = {}
+    for name in available():
+        backend = get_backend(name)
+        t = timed(lambda: [backend.table_rows(f) for page in fragments for f in page], runs)
+        out[f'parse_ms.{name}'] = t / len(pages) * 1000
+    return out
+
+
+def bench_draft(runs, path=DRAFT_FIXTURE):
+    """ms to turn a whole draft page into store rows, for each installed backend."""
+    with open(path) as f:
+        html = f.read()
+    out = {}
+    for name in available():
+        assert parse_draft(html, 2013, name), f"{name} found no picks in {path}"
+        out[f'draft_parse_ms.{name}'] = timed(lambda: parse_draft(html, 2013, name), runs) * 1000
+    return out
+
+
+def bench_extractors(pages, runs):
+    """Pages/sec for each extractor on its own, and for all of them together (fresh page each time)."""
+    out = {}
+    for name in list(EXTRACTORS) + [None]:
+        only = None if name is None else [name]
+        t = timed(lambda: [extract(PlayerPage(pid, html), only) for pid, html in pages], runs)
+        out[f'extract_pages_per_s.{name or "all"}'] = len(pages) / t
+    return out
+
+
+def bench_end_to_end(pages, players=E2E_PLAYERS):
+    """Players/sec from an empty cache: fetch from the stub server, then parse from the cache."""
+    player_ids = [f"Stub{i:04d}" for i in range(players)]
+    recorded = {f"/players/{pid[0]}/{pid}.htm": html
+                for pid, (_, html) in zip(player_ids, pages * (players // len(pages) + 1))}
+
+    with StubServer(recorded) as server:
+        page_cache.BASE_URL = server.url
+        urls = [page_cache.player_url(pid) for pid in player_ids]
+        start = time.perf_counter()
+        fetcher.fetch_many(urls)
+        fetched = time.perf_counter()
+        for url in urls:
+            parse_one(('cache', url))
+        done = time.perf_counter()
+
+    return {
+        'e2e_players_per_s': players / (done - start),
+        'e2e_fetch_players_per_s': players / (fetched - start),
+    }
+
+
+def bench_archive(runs):
+    """µs to look up and decompress one page from an archive of whatever the end-to-end run cached."""
+    try:
+        page_archive._zstd()
+    except ImportError:
+        print("⚠️ zstandard isn't installed, skipping the archive benchmark")
+        return {}
+    path = os.path.join(_TMP, "pages.warc.zst")
+    page_archive.build(path)
+    with page_archive.Archive(path) as archive:
+        player_ids = archive.player_ids()
+        t = timed(lambda: [archive.get(pid) for pid in player_ids], runs)
+    return {'archive_lookup_us': t / len(player_ids) * 1e6}
+
+
+def synthetic_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Player_ID': [f"Synt{i:07d}" for i in range(n)],
+        'Career_AV': rng.integers(0, 120, n),
+        'Games_Played': rng.integers(0, 200, n),
+        'Seasons_1000yd': rng.integers(0, 8, n),
+        'Pro_Bowls': rng.integers(0, 8, n),
+        'All_Pros': rng.integers(0, 4, n),
+        'OPOY': rng.random(n) < 0.01,
+        'Fantasy_Seasons': rng.integers(0, 8, n),
+        'Rec/Game': rng.random(n) * 8,
+        'Yards/Game': rng.random(n) * 100,
+        'TD/Game': rng.random(n) * 0.8,
+    })
+
+
+def bench_scorer(sizes=SCORER_ROWS):
+    out = {}
+    for n in sizes:
+        df = synthetic_rows(n)
+        t = timed(lambda: scoring.evaluate(df), 3 if n < 1_000_000 else 1)
+        out[f'score_rows_per_s.{n}'] = n / t
+    return out
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def _slower(metric, now, before):
+    # Latencies regress upwards, throughputs downwards
+    if metric.startswith(('parse_ms', 'draft_parse_ms', 'archive_lookup_us')):
+        return now > before * REGRESSION
+    return now * REGRESSION < before
+
+
+def report(results, previous):
+    regressions = []
+    for metric, value in results.items():
+        before = (previous or {}).get('metrics', {}).get(metric)
+        change = f" (was {before:,.2f})" if before else ""
+        flag = ""
+        if before and _slower(metric, value, before):
+            flag = " 🐢 REGRESSION"
+            regressions.append(metric)
+        print(f"  {metric:40s} {value:>14,.2f}{change}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on recorded pages.")
+    parser.add_argument("--fixtures", help=f"directory of extra recorded pages (.htm / .htm.gz), on top of {FIXTURES}")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--players", type=int, default=E2E_PLAYERS)
+    parser.add_argument("--max-rows", type=int, default=max(SCORER_ROWS))
+    parser.add_argument("--results", default=RESULTS)
+    args = parser.parse_args()
+
+    pages = fixture_pages(args.fixtures)
+    print(f"📄 {len(pages)} recorded pages, backends: {', '.join(available())}")
+
+    results = {}
+    results.update(bench_parse(pages, args.runs))
+    results.update(bench_draft(args.runs))
+    results.update(bench_extractors(pages, args.runs))
+    results.update(bench_end_to_end(pages, args.players))
+    results.update(bench_archive(args.runs))
+    results.update(bench_scorer([n for n in SCORER_ROWS if n <= args.max_rows]))
+
+    previous = _previous(args.results)
+    regressions = report(results, previous)
+
+    run = {'time': time.time(), 'commit': _commit(), 'python': platform.python_version(),
+           'backends': available(), 'pages': len(pages), 'metrics': results}
+    with open(args.results, 'a') as f:
+        f.write(json.dumps(run) + '\n')
+    print(f"💾 Saved to {args.results}" + (f", {len(regressions)} regressions" if regressions else ""))
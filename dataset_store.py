@@ -0,0 +1,206 @@
+import os
+
+import pandas as pd
+
+import metrics
+
+# === Typed dataset store ===
+# One Parquet file per table under data/ with a fixed schema, instead of a
+# chain of loosely versioned CSVs that every stage re-parses and re-coerces.
+# Numbers are nullable ints/floats, flags are booleans and the low-cardinality
+# text columns are categoricals. Stages read only the columns they need and
+# upsert only the columns they produce, keyed on Player_ID.
+
+STORE_DIR = os.environ.get("WR_STORE_DIR", "data")
+
+SCHEMA = {
+    # draft info
+    'Year': 'Int16',
+    'Player': 'string',
+    'Player_ID': 'string',
+    'College': 'category',
+    'Pick': 'Int16',
+    'Round': 'Int8',
+    'Team': 'category',
+    'Pos': 'category',
+    'Age': 'Int8',
+    # career stats
+    'Career_AV': 'Int32',
+    'Games_Played': 'Int32',
+    'Seasons_Played': 'Int8',
+    'Receptions': 'Int32',
+    'Receiving_Yards': 'Int32',
+    'Receiving_TDs': 'Int32',
+    'Career_Yards': 'Int32',
+    'Career_TDs': 'Int32',
+    'Rec/Game': 'Float64',
+    'Yards/Game': 'Float64',
+    'TD/Game': 'Float64',
+    'Seasons_1000yd': 'Int8',
+    # honors
+    'Pro_Bowls': 'Int8',
+    'All_Pros': 'Int8',
+    'OPOY': 'boolean',
+    # scores
+    'Estimated_Seasons': 'Int8',
+    'Success_Score': 'Float64',
+    'Successful': 'boolean',
+    'Performance_Score': 'Float64',
+    'Note': 'string',
+    'Fantasy_Seasons': 'Int8',
+    # player-season facts (the "seasons" table, see season_facts.py)
+    'season': 'Int16',
+    'team': 'category',
+    'g': 'Int8',
+    'gs': 'Int8',
+    'rec': 'Int16',
+    'rec_yds': 'Int16',
+    'rec_td': 'Int8',
+    'av': 'Int8',
+    'awards': 'string',
+    # fetch freshness (the "freshness" table, see freshness.py)
+    'Last_Fetched': 'Float64',
+    'Last_Season': 'Int16',
+    'Status': 'category',
+}
+
+# Old CSVs in the order they were produced; later files win where they have a value
+LEGACY_CSVS = [
+    "wr_draft_data_2013_2022.csv",
+    "wr_draft_data_enriched.csv",
+    "wr_draft_enriched.csv",
+    "wr_draft_fully_enriched.csv",
+    "wr_draft_full_enriched.csv",
+    "wr_draft_scored.csv",
+]
+
+_TRUE = {'true', '1', '1.0', 'yes'}
+_FALSE = {'false', '0', '0.0', 'no'}
+
+
+def _to_bool(value):
+    if pd.isna(value):
+        return pd.NA
+    text = str(value).strip().lower()
+    return True if text in _TRUE else False if text in _FALSE else pd.NA
+
+
+def _coerce_column(series, dtype):
+    if dtype == 'boolean':
+        return series.map(_to_bool).astype('boolean')
+    if dtype.startswith('Int'):
+        return pd.to_numeric(series, errors='coerce').round().astype(dtype)
+    if dtype == 'Float64':
+        return pd.to_numeric(series, errors='coerce').astype(dtype)
+    if dtype == 'string':
+        return series.astype('string').replace({'N/A': pd.NA, 'nan': pd.NA})
+    return series.astype(dtype)
+
+
+def coerce(df):
+    """Cast every known column to its schema type. Unknown columns are left alone."""
+    df = df.copy()
+    for col, dtype in SCHEMA.items():
+        if col in df.columns and str(df[col].dtype) != dtype:
+            df[col] = _coerce_column(df[col], dtype)
+    return df
+
+
+def path(table='players'):
+    return os.path.join(STORE_DIR, f"{table}.parquet")
+
+
+def exists(table='players'):
+    return os.path.exists(path(table))
+
+
+def save(df, table='players'):
+    """Replace a table with `df` (coerced to the schema), atomically."""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp = path(table) + ".tmp"
+    with metrics.stage('store'):
+        coerce(df).to_parquet(tmp, engine='pyarrow', index=False)
+        os.replace(tmp, path(table))
+    metrics.inc('wr_rows_written_total', len(df), table=table)
+    metrics.event('rows_written', table=table, rows=len(df))
+
+
+def load(columns=None, table='players', arrow=False):
+    """
+    Read a table, optionally just some columns.
+
+    arrow=True keeps the columns Arrow-backed (memory-mapped, no conversion
+    copy), which is what the notebooks want for poking around.
+    """
+    import pyarrow.parquet as pq
+    if columns is not None:
+        # Projection on columns a later stage hasn't written yet just leaves them out
+        present = set(pq.read_schema(path(table)).names)
+        columns = [c for c in columns if c in present]
+    if arrow:
+        return pq.read_table(path(table), columns=columns, memory_map=True).to_pandas(
+            types_mapper=pd.ArrowDtype)
+    return pd.read_parquet(path(table), columns=columns, engine='pyarrow')
+
+
+def upsert(df, columns=None, table='players', key='Player_ID'):
+    """
+    Write `columns` of `df` into a table by `key`: existing rows are patched, new ones appended.
+
+    Only the named columns are touched, so two stages writing different
+    columns never clobber each other. `key` can be a list for tables with a
+    compound key.
+    """
+    keys = [key] if isinstance(key, str) else list(key)
+    columns = [c for c in (columns or df.columns) if c not in keys]
+    new = df[keys + columns].drop_duplicates(keys, keep='last').set_index(keys)
+    if not exists(table):
+        save(new.reset_index(), table)
+        return len(new)
+
+    current = load(table=table).set_index(keys)
+    out = current.reindex(current.index.union(new.index, sort=False))
+    for col in columns:
+        values = out[col].astype(object) if col in out.columns else pd.Series(None, index=out.index, dtype=object)
+        values.loc[new.index] = new[col].astype(object)
+        out[col] = values
+    save(out.reset_index(), table)
+    return len(new)
+
+
+def replace(df, table, key='Player_ID'):
+    """Swap out every row for the `key` values in `df` with the rows in `df`."""
+    if exists(table):
+        current = load(table=table)
+        df = pd.concat([current[~current[key].isin(df[key])], df], ignore_index=True)
+    save(df, table)
+    return len(df)
+
+
+def export_csv(csv_path, columns=None, table='players'):
+    """Dump a table back to CSV for anyone who still wants a spreadsheet."""
+    load(columns, table).to_csv(csv_path, index=False)
+
+
+def import_csvs(csv_paths=LEGACY_CSVS, table='players'):
+    """One-time migration: fold the old wr_draft_*.csv chain into the store."""
+    merged = None
+    for csv_path in csv_paths:
+        if not os.path.exists(csv_path):
+            continue
+        df = coerce(pd.read_csv(csv_path)).drop_duplicates('Player_ID', keep='last').set_index('Player_ID')
+        merged = df if merged is None else df.combine_first(merged)
+        print(f"📥 {csv_path}: {len(df)} rows")
+    if merged is None:
+        print("⚠️ No CSVs found to import.")
+        return None
+    merged = merged.reset_index().sort_values(['Year', 'Pick'], na_position='last')
+    ordered = [c for c in SCHEMA if c in merged.columns]
+    save(merged[ordered + [c for c in merged.columns if c not in ordered]], table)
+    return merged
+
+
+if __name__ == "__main__":
+    merged = import_csvs()
+    if merged is not None:
+        print(f"✅ Imported {len(merged)} players into {path()}")
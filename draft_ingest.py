@@ -0,0 +1,96 @@
+import argparse
+
+import pandas as pd
+
+import dataset_store
+from fetcher import fetch_many
+from html_fragments import find_table
+from html_parser import get_backend
+from page_cache import draft_url, get_cached
+
+# === Draft ingestion ===
+# Every pick of every draft year, all positions, in one "drafts" store table
+# keyed on (Year, Pick). Years are fetched concurrently through the shared
+# rate limiter (fetcher.py) and each year is replaced as a whole, so
+# re-ingesting a year never leaves stale rows behind. Picking out WRs (or RBs,
+# TEs, ...) is then a filter on the stored table, not a re-scrape.
+
+TABLE = 'drafts'
+
+# data-stat -> store column
+DRAFT_STATS = {
+    'draft_round': 'Round',
+    'draft_pick': 'Pick',
+    'team': 'Team',
+    'player': 'Player',
+    'pos': 'Pos',
+    'age': 'Age',
+    'college_id': 'College',
+}
+ID_ATTR = 'data-append-csv'
+
+
+def parse_draft(html, year, parser=None):
+    """All picks on a draft page as store rows ([] if the drafts table is missing)."""
+    fragment = find_table(html, 'drafts')
+    if not fragment:
+        return []
+    rows = []
+    for cells in get_backend(parser).table_rows(fragment, DRAFT_STATS, attr=ID_ATTR):
+        row = {'Year': year}
+        for stat, col in DRAFT_STATS.items():
+            row[col] = cells.get(stat, '')
+        # Players who never took an NFL snap have no page (and no ID)
+        row['Player_ID'] = cells.get(f'player@{ID_ATTR}') or None
+        rows.append(row)
+    return rows
+
+
+def ingest(start_year, end_year, parser=None):
+    """Fetch and store every pick from start_year..end_year. Returns the new rows."""
+    years = list(range(start_year, end_year + 1))
+    statuses = fetch_many(draft_url(year) for year in years)
+
+    frames = []
+    for year in years:
+        html = get_cached(draft_url(year))
+        if html is None:
+            print(f"⚠️ {year}: draft page not fetched ({statuses.get(draft_url(year))})")
+            continue
+        rows = parse_draft(html, year, parser)
+        if not rows:
+            print(f"⚠️ {year}: no draft table found")
+            continue
+        frames.append(pd.DataFrame(rows))
+
+    if not frames:
+        return pd.DataFrame()
+    drafts = pd.concat(frames, ignore_index=True)
+    dataset_store.replace(drafts, TABLE, key='Year')
+    return drafts
+
+
+def select(positions=('WR',), start_year=None, end_year=None, columns=None):
+    """Stored picks at the given positions (and years), e.g. select(['RB', 'TE'])."""
+    if columns is not None:
+        columns = list(dict.fromkeys(['Year', 'Pos'] + list(columns)))
+    drafts = dataset_store.load(columns, table=TABLE)
+    keep = drafts['Pos'].isin(list(positions))
+    if start_year is not None:
+        keep &= drafts['Year'] >= start_year
+    if end_year is not None:
+        keep &= drafts['Year'] <= end_year
+    return drafts[keep].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest every pick of a range of NFL drafts.")
+    parser.add_argument("start_year", type=int)
+    parser.add_argument("end_year", type=int, nargs="?")
+    args = parser.parse_args()
+
+    drafts = ingest(args.start_year, args.end_year or args.start_year)
+    if len(drafts):
+        for year, count in drafts.groupby('Year').size().items():
+            print(f"  {year}: {count} picks")
+        print(f"✅ Stored {len(drafts)} picks in {dataset_store.path(TABLE)}")
@@ -1,20 +1,16 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import time
-import re
-
-BASE_URL = "https://www.pro-football-reference.com/players"
-
-def get_player_url(player_name):
-    last, first = player_name.split(",") if "," in player_name else ("", "")
-    if not first or not last:
-        return None
-    player_id = (last[:4] + first[:2]).title().replace(" ", "") + "00"
-    first_letter = last[0].upper()
-    return f"{BASE_URL}/{first_letter}/{player_id}.htm"
-
-def scrape_player_stats(url):
+import dataset_store
+from page_cache import cached_get, player_url, polite_sleep
+from player_index import PlayerIndex
+from player_page import PlayerPage, extract
+
+def get_player_id(index, row):
+    # Resolved against the local index (python player_index.py), never guessed
+    if pd.notna(row.get('Player_ID')):
+        return row['Player_ID']
+    return index.resolve(row['Player'], year=row.get('Year'), college=row.get('College'))
+
+def scrape_player_stats(player_id):
     stats = {
         'Games_Played': None,
         'Career_AV': None,
@@ -24,66 +20,61 @@ def scrape_player_stats(url):
     }
 
     try:
-        res = requests.get(url, headers={
-            "User-Agent": "Mozilla/5.0"
-        })
-        soup = BeautifulSoup(res.text, 'html.parser')
-
-        # Find AV and Games from the summary box
-        summary = soup.find('div', {'id': 'meta'})
-        if summary:
-            info_text = summary.text
-            g_match = re.search(r'G\b.*?(\d+)', info_text)
-            av_match = re.search(r'AV\b.*?(\d+)', info_text)
-            if g_match:
-                stats['Games_Played'] = int(g_match.group(1))
-            if av_match:
-                stats['Career_AV'] = int(av_match.group(1))
-
-        # Find receiving career totals
-        rec_table = soup.find('table', {'id': 'receiving_and_rushing'})
-        if rec_table:
-            tfoot = rec_table.find('tfoot')
-            if tfoot:
-                row = tfoot.find('tr')
-                stats['Receiving_Yards'] = int(row.find('td', {'data-stat': 'rec_yds'}).text.replace(",", ""))
-                stats['Receiving_TDs'] = int(row.find('td', {'data-stat': 'rec_td'}).text)
-
-        # Estimate seasons played from the years in player stats table
-        years = soup.find_all('th', {'data-stat': 'year_id'})
-        year_values = sorted({int(y.text) for y in years if y.text.isdigit()})
-        if year_values:
-            stats['Seasons_Played'] = len(set(year_values))
+        res = cached_get(player_url(player_id))
+        if not res.ok:
+            print(f"Error scraping {player_id}: HTTP {res.status_code}")
+            return stats
+
+        # Same parse as the pipeline: configured backend, commented-out tables included
+        page = PlayerPage(player_id, res.text)
+        record = extract(page, ['career_totals'])
+        for col in ('Games_Played', 'Career_AV', 'Receiving_Yards', 'Receiving_TDs'):
+            stats[col] = record.get(col)
+
+        # Seasons with a game in them, the same count season_facts.career_metrics makes
+        seasons = page.seasons()
+        if seasons is not None and len(seasons['season']):
+            stats['Seasons_Played'] = int((seasons['g'] > 0).sum())
 
     except Exception as e:
-        print(f"Error scraping {url}: {e}")
+        print(f"Error scraping {player_id}: {e}")
 
     return stats
 
 # Load your WR draft data
-df = pd.read_csv('wr_draft_data_2013_2022.csv')
+df = dataset_store.load(['Player_ID', 'Player', 'Year', 'College'])
+index = PlayerIndex()
+
+scraped = []
 
-# Add new stat columns
-df['Games_Played'] = None
-df['Career_AV'] = None
-df['Receiving_Yards'] = None
-df['Receiving_TDs'] = None
-df['Seasons_Played'] = None
+# Every ID is resolved offline before a single player page is requested
+missing = df['Player_ID'].isna()
+df['Player_ID'] = [get_player_id(index, row) for _, row in df.iterrows()]
+resolved = df[missing & df['Player_ID'].notna()]
+if not resolved.empty:
+    # Store the new IDs on their rows first, so the stats below land on the right players
+    dataset_store.upsert(resolved, ['Player_ID'], key=['Player', 'Year'])
+    print(f"🔎 Resolved {len(resolved)} missing player IDs")
 
 for i, row in df.iterrows():
     player_name = row['Player']
-    url = get_player_url(player_name)
+    url = player_url(row['Player_ID']) if pd.notna(row['Player_ID']) else None
     if not url:
-        print(f"Skipping {player_name} - could not generate URL")
+        print(f"Skipping {player_name} - not in the player index (or ambiguous)")
         continue
 
     print(f"Scraping: {player_name} → {url}")
-    stats = scrape_player_stats(url)
-
-    for key in stats:
-        df.at[i, key] = stats[key]
-
-    time.sleep(1.5)  # Be kind to PFR. They remember.
-
-df.to_csv('wr_draft_enriched.csv', index=False)
-print("✅ WR data enriched and saved to 'wr_draft_enriched.csv'")
+    stats = scrape_player_stats(row['Player_ID'])
+    scraped.append({'Player_ID': row['Player_ID'], **stats})
+
+    polite_sleep(1.5)  # Be kind to PFR. They remember.
+
+# Only write what this run actually found: skipped players and stats a page didn't
+# have keep whatever other stages already stored for them
+scraped = pd.DataFrame(scraped, columns=['Player_ID', 'Games_Played', 'Career_AV', 'Receiving_Yards',
+                                         'Receiving_TDs', 'Seasons_Played'])
+for col in scraped.columns[1:]:
+    found = scraped[scraped[col].notna()]
+    if not found.empty:
+        dataset_store.upsert(found, [col])
+print(f"✅ WR data enriched and saved to {dataset_store.path()}")
@@ -0,0 +1,181 @@
+import asyncio
+import email.utils
+import json
+import os
+import time
+
+import metrics
+import page_cache
+
+# === Settings (override with env vars) ===
+# PFR's published limit is 20 requests a minute; the bucket never goes above
+# MAX_RATE and backs off below it whenever the site answers 429.
+MAX_RATE = float(os.environ.get("WR_MAX_RATE", str(20 / 60)))   # requests per second
+BURST = int(os.environ.get("WR_BURST", "2"))
+CONCURRENCY = int(os.environ.get("WR_CONCURRENCY", "4"))
+STATE_FILE = os.environ.get("WR_FETCH_STATE", ".fetch_state.json")
+
+MIN_BACKOFF = 30          # seconds, used when a 429 has no Retry-After
+MAX_BACKOFF = 60 * 60
+MAX_ATTEMPTS = 5
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0, when.timestamp() - time.time())
+
+
+class FetchState:
+    """Cooldown and current rate, saved to disk so a restart doesn't walk straight back into a 429."""
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.rate = MAX_RATE
+        self.cooldown_until = 0
+        self.strikes = 0
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    saved = json.load(f)
+                self.rate = min(MAX_RATE, saved.get('rate', MAX_RATE))
+                self.cooldown_until = saved.get('cooldown_until', 0)
+                self.strikes = saved.get('strikes', 0)
+            except (OSError, ValueError):
+                pass
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({'rate': self.rate, 'cooldown_until': self.cooldown_until,
+                       'strikes': self.strikes}, f)
+        os.replace(tmp, self.path)
+
+    def rate_limited(self, retry_after=None):
+        """Record a 429: halve the rate and cool down for Retry-After (or exponential backoff)."""
+        self.strikes += 1
+        self.rate = max(MAX_RATE / 16, self.rate / 2)
+        wait = retry_after if retry_after is not None else MIN_BACKOFF * 2 ** (self.strikes - 1)
+        wait = min(wait, MAX_BACKOFF)
+        self.cooldown_until = max(self.cooldown_until, time.time() + wait)
+        self.save()
+        return wait
+
+    def succeeded(self):
+        """Creep the rate back up towards MAX_RATE after a clean response."""
+        if self.strikes or self.rate < MAX_RATE:
+            self.strikes = 0
+            self.rate = min(MAX_RATE, self.rate * 1.1)
+            self.save()
+
+
+class TokenBucket:
+    """Async token bucket whose refill rate follows the shared FetchState."""
+
+    def __init__(self, state, burst=BURST):
+        self.state = state
+        self.burst = burst
+        self.tokens = 1
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                cooldown = self.state.cooldown_until - time.time()
+                if cooldown > 0:
+                    await asyncio.sleep(cooldown)
+                    self.tokens = 1
+                    self.updated = time.monotonic()
+
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.state.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.state.rate)
+
+
+async def _fetch(url, bucket, state):
+    # Fresh cache hits don't need a token at all
+    if page_cache.is_fresh(url):
+        metrics.inc('wr_cache_requests_total', result='hit')
+        return url, 200
+
+    status = None
+    for attempt in range(MAX_ATTEMPTS):
+        await bucket.acquire()
+        try:
+            response = await asyncio.to_thread(page_cache.cached_get, url, force=True)
+        except Exception as e:
+            print(f"⚠️ {url}: {e}")
+            metrics.inc('wr_fetch_retries_total', reason='error')
+            metrics.event('retry', url=url, reason='error', error=str(e), attempt=attempt + 1)
+            await asyncio.sleep(min(MAX_BACKOFF, 5 * 2 ** attempt))
+            continue
+
+        status = response.status_code
+        if status == 429:
+            wait = state.rate_limited(parse_retry_after(response.headers.get("Retry-After")))
+            print(f"🛑 429 on {url}. Cooling down {wait:.0f}s, rate now {state.rate * 60:.1f}/min")
+            metrics.inc('wr_rate_limited_total')
+            metrics.inc('wr_fetch_retries_total', reason='429')
+            metrics.event('rate_limited', url=url, wait=round(wait, 1), rate_per_min=round(state.rate * 60, 2))
+            continue
+
+        state.succeeded()
+        return url, status
+
+    return url, status
+
+
+async def fetch_all(urls, concurrency=CONCURRENCY, on_result=None):
+    """Warm the page cache for `urls` as fast as the rate limit allows. Returns {url: status}."""
+    state = FetchState()
+    bucket = TokenBucket(state)
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    results = {}
+
+    async def worker():
+        while True:
+            try:
+                url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            url, status = await _fetch(url, bucket, state)
+            results[url] = status
+            if on_result:
+                on_result(url, status)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+def fetch_many(urls, **kwargs):
+    """Blocking wrapper around fetch_all() for the batch scripts."""
+    with metrics.stage('fetch'):
+        return asyncio.run(fetch_all(list(urls), **kwargs))
+
+
+def prefetch_players(player_ids, **kwargs):
+    """Warm the cache for a list of player IDs, printing progress as pages land."""
+    urls = [page_cache.player_url(pid) for pid in player_ids]
+    done = [0]
+
+    def progress(url, status):
+        done[0] += 1
+        mark = "✅" if status == 200 else "⚠️"
+        print(f"{mark} {done[0]}/{len(urls)}: {url.rsplit('/', 1)[-1]} ({status})")
+
+    return fetch_many(urls, on_result=progress, **kwargs)
@@ -0,0 +1,148 @@
+import time
+
+import pandas as pd
+
+import dataset_store
+import page_cache
+import season_facts
+from player_page import PlayerPage
+
+# === Fetch freshness ===
+# What we last saw of each player: when their page was fetched, the latest
+# season on it, and whether the career is still going. A player whose page
+# was fetched RETIRED_AFTER or more seasons after the last season on that page
+# is retired: those stats can't change, so the scheduler never asks for that
+# page again unless forced. Without a page (or a seasons table on it) we can't
+# tell, and the player stays active; nothing else, draft year included, is
+# allowed to retire anyone. Active players
+# come due on a TTL that's short in season and long in the offseason; players
+# we've never fetched come first of all.
+
+TABLE = 'freshness'
+RETIRED_AFTER = 2
+
+DAY = page_cache.DAY
+TTLS = {
+    'in_season': page_cache.TTLS['player'],   # a new game every week
+    'offseason': 30 * DAY,                    # only the odd AV / awards correction
+}
+PRIORITY = {'new': 0, 'active': 1}            # lower runs first; retired never runs
+
+
+def nfl_season(ts=None):
+    """The season a timestamp falls in (Jan/Feb belong to the previous year's season)."""
+    t = time.localtime(ts)
+    return t.tm_year if t.tm_mon >= 9 else t.tm_year - 1
+
+
+def in_season(ts=None):
+    return time.localtime(ts).tm_mon in (9, 10, 11, 12, 1, 2)
+
+
+def classify(last_season, fetched_at):
+    if pd.isna(last_season) or pd.isna(fetched_at):
+        return 'active'
+    return 'retired' if nfl_season(fetched_at) - int(last_season) >= RETIRED_AFTER else 'active'
+
+
+def load():
+    if not dataset_store.exists(TABLE):
+        return pd.DataFrame(columns=['Player_ID', 'Last_Fetched', 'Last_Season', 'Status'])
+    return dataset_store.load(table=TABLE)
+
+
+def last_seasons(rows):
+    """{Player_ID: latest season} from season fact rows the caller already parsed."""
+    latest = {}
+    for row in rows:
+        player_id = row['Player_ID']
+        latest[player_id] = max(row['season'], latest.get(player_id, row['season']))
+    return latest
+
+
+def last_season(player_id, url=None):
+    """The latest season on a player's cached page, or None if there's no page or seasons table."""
+    html = page_cache.get_cached(url or page_cache.player_url(player_id), touch=False)
+    if html is None:
+        return None
+    try:
+        rows = season_facts.season_rows(PlayerPage(player_id, html))
+    except Exception:
+        return None
+    return max((row['season'] for row in rows), default=None)
+
+
+def record(player_ids, seasons=None, fetched=None):
+    """
+    Note what the cached page of each player shows now. Call once their pages are parsed.
+
+    Pass the parse's results as `seasons` ({Player_ID: latest season}, see
+    last_seasons(); a player missing from it had no seasons table) so the
+    pages aren't parsed a second time. Without it each page is parsed here.
+    Results parsed on another host (work_queue) bring `fetched` too,
+    {Player_ID: fetched_at}, since this host's cache may not have the pages.
+    """
+    urls = {pid: page_cache.player_url(pid) for pid in player_ids}
+    if fetched is None:
+        times = page_cache.fetched_times(urls.values())
+        fetched = {pid: times[url] for pid, url in urls.items() if url in times}
+    ids = [pid for pid in urls if fetched.get(pid) is not None]
+    if not ids:
+        return 0
+
+    rows = pd.DataFrame({'Player_ID': ids})
+    rows['Last_Fetched'] = [fetched[pid] for pid in ids]
+    latest = [seasons.get(pid) if seasons is not None else last_season(pid, urls[pid]) for pid in ids]
+    rows['Last_Season'] = pd.array(latest, dtype='Int16')
+    rows['Status'] = [classify(s, f) for s, f in zip(rows['Last_Season'], rows['Last_Fetched'])]
+    dataset_store.upsert(rows, table=TABLE)
+    return len(rows)
+
+
+def schedule(force=False, player_ids=None, now=None):
+    """
+    Every player with their status, priority and when they're next due, most urgent first.
+
+    Players with no freshness row yet but a page in the cache are recorded from
+    it first, so an existing dataset doesn't get refetched wholesale. Their
+    latest season comes from the stored season facts (parsed from that same
+    page); only pages without facts are parsed again.
+    """
+    now = time.time() if now is None else now
+    ids = list(player_ids) if player_ids else dataset_store.load(['Player_ID'])['Player_ID'].dropna().unique().tolist()
+    known = load()
+    recorded = set(known['Player_ID'])
+    unseen = [pid for pid in ids if pid not in recorded]
+    if unseen:
+        stored = {}
+        if dataset_store.exists(season_facts.TABLE):
+            facts = season_facts.load_seasons(['Player_ID', 'season'])
+            facts = facts[facts['Player_ID'].isin(unseen)]
+            stored = facts.groupby('Player_ID')['season'].max().astype(int).to_dict()
+        record([pid for pid in unseen if pid in stored], stored)
+        record([pid for pid in unseen if pid not in stored])
+        known = load()
+
+    df = pd.DataFrame({'Player_ID': ids}).merge(known, on='Player_ID', how='left')
+    df['Status'] = df['Status'].astype(object).where(df['Last_Fetched'].notna(), 'new')
+    ttl = TTLS['in_season' if in_season(now) else 'offseason']
+    df['Due_At'] = (df['Last_Fetched'].astype(float) + ttl).where(df['Status'] == 'active', 0.0)
+    df.loc[df['Status'] == 'retired', 'Due_At'] = float('inf')
+    df['Priority'] = df['Status'].map(PRIORITY).astype('Int8')
+    if force:
+        df['Due_At'] = 0.0
+        df['Priority'] = df['Priority'].fillna(len(PRIORITY))
+    df['Due'] = df['Due_At'] <= now
+    return df.sort_values(['Priority', 'Due_At'], na_position='last', kind='stable').reset_index(drop=True)
+
+
+def due(force=False, player_ids=None):
+    """Player IDs to fetch this run: never-fetched first, then the most overdue active players."""
+    df = schedule(force, player_ids)
+    return df.loc[df['Due'], 'Player_ID'].tolist()
+
+
+if __name__ == "__main__":
+    df = schedule()
+    print(df['Status'].value_counts().to_string())
+    print(f"⏰ {int(df['Due'].sum())} due now ({'in season' if in_season() else 'offseason'})")
@@ -0,0 +1,48 @@
+import re
+
+# PFR ships most stats tables inside <!-- ... --> so they render lazily. Rather
+# than parse the whole page and walk every Comment node, these helpers scan the
+# raw HTML string once with str.find and slice out just the fragment we want.
+# The comment markers sit outside the <table> ... </table> span, so a table
+# slice works the same whether it was commented out or not.
+
+
+def find_table(html, table_id):
+    """Raw `<table id=table_id> ... </table>` markup from anywhere in the page, or None."""
+    for quote in ('"', "'"):
+        at = html.find(f'id={quote}{table_id}{quote}')
+        while at != -1:
+            start = html.rfind('<table', 0, at)
+            # The id has to belong to the <table> tag itself, not a div around it
+            if start != -1 and html.find('>', start, at) == -1:
+                end = html.find('</table>', at)
+                if end == -1:
+                    return None
+                return html[start:end + len('</table>')]
+            at = html.find(f'id={quote}{table_id}{quote}', at + 1)
+    return None
+
+
+def find_comment(html, marker):
+    """Body of the first HTML comment containing `marker`, or None."""
+    at = html.find(marker)
+    while at != -1:
+        start = html.rfind('<!--', 0, at)
+        if start != -1:
+            closed = html.find('-->', start, at)
+            if closed == -1:
+                end = html.find('-->', at)
+                return html[start + 4:end if end != -1 else len(html)]
+        at = html.find(marker, at + 1)
+    return None
+
+
+def comments_from_dump(text):
+    """Comment bodies from a `--- Comment N ---` dump like hopkins_html_comments_dump.txt."""
+    return re.findall(r'--- Comment \d+ ---\n\n(.*?)\n*--- End Comment ---', text, re.DOTALL)
+
+
+def page_from_dump(text):
+    """Rebuild a page-shaped HTML document from a comment dump, for offline fixtures."""
+    body = "\n<div>filler</div>\n".join(f"<!--{c}-->" for c in comments_from_dump(text))
+    return f"<html><body><div id=\"meta\"></div>\n{body}\n</body></html>"
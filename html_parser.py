@@ -0,0 +1,151 @@
+import os
+
+# === Parser backends ===
+# Every backend answers the same two questions the extractors ask of a page:
+#   table_rows(fragment, stats, attr) -> [{data-stat: cell text}, ...] for each <tbody> row,
+#                                 keeping only the cells named in `stats` (all if None).
+#                                 With `attr`, cells carrying that attribute also add
+#                                 {"<data-stat>@<attr>": value} (e.g. player@data-append-csv)
+#   element_text(html, el_id)  -> text content of the element with that id, or None
+# Pick one with WR_PARSER=selectolax|lxml|html.parser; "auto" (the default)
+# uses the fastest one that's installed.
+
+PARSER = os.environ.get("WR_PARSER", "auto")
+
+
+def _skip_row(classes):
+    # PFR repeats the header every 20 rows as <tr class="thead">
+    return 'thead' in (classes or '').split()
+
+
+def _wanted(stat, stats):
+    return stat is not None and (stats is None or stat in stats)
+
+
+def _with_attr(row, cells, attr):
+    # cells: (data-stat, attribute value or None) for the cells kept in `row`
+    for stat, value in cells:
+        if value is not None:
+            row[f'{stat}@{attr}'] = value
+    return row
+
+
+class BS4Backend:
+    name = 'html.parser'
+
+    def __init__(self, features='html.parser'):
+        from bs4 import BeautifulSoup
+        self._soup = lambda html: BeautifulSoup(html, features)
+
+    def table_rows(self, fragment, stats=None, attr=None):
+        rows = []
+        tbody = self._soup(fragment).find('tbody')
+        for tr in tbody.find_all('tr', recursive=False) if tbody else []:
+            if _skip_row(' '.join(tr.get('class', []))):
+                continue
+            cells = [cell for cell in tr.find_all(['th', 'td'], recursive=False)
+                     if _wanted(cell.get('data-stat'), stats)]
+            row = {cell['data-stat']: cell.get_text().strip() for cell in cells}
+            if attr:
+                _with_attr(row, ((cell['data-stat'], cell.get(attr)) for cell in cells), attr)
+            rows.append(row)
+        return rows
+
+    def element_text(self, html, el_id):
+        el = self._soup(html).find(id=el_id)
+        return el.get_text(" ") if el else None
+
+
+class LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        self._parse = lxml.html.fromstring
+
+    def table_rows(self, fragment, stats=None, attr=None):
+        rows = []
+        for tr in self._parse(fragment).xpath('.//tbody/tr'):
+            if _skip_row(tr.get('class')):
+                continue
+            cells = [cell for cell in tr.xpath('./th|./td') if _wanted(cell.get('data-stat'), stats)]
+            row = {cell.get('data-stat'): cell.text_content().strip() for cell in cells}
+            if attr:
+                _with_attr(row, ((cell.get('data-stat'), cell.get(attr)) for cell in cells), attr)
+            rows.append(row)
+        return rows
+
+    def element_text(self, html, el_id):
+        found = self._parse(html).xpath(f'//*[@id="{el_id}"]')
+        return " ".join(found[0].itertext()) if found else None
+
+
+class SelectolaxBackend:
+    name = 'selectolax'
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as Parser
+        except ImportError:
+            from selectolax.parser import HTMLParser as Parser
+        self._parse = Parser
+
+    def table_rows(self, fragment, stats=None, attr=None):
+        rows = []
+        for tr in self._parse(fragment).css('tbody > tr'):
+            if _skip_row(tr.attributes.get('class')):
+                continue
+            cells = [cell for cell in tr.iter()
+                     if cell.tag in ('th', 'td') and _wanted(cell.attributes.get('data-stat'), stats)]
+            row = {cell.attributes['data-stat']: cell.text().strip() for cell in cells}
+            if attr:
+                _with_attr(row, ((cell.attributes['data-stat'], cell.attributes.get(attr)) for cell in cells), attr)
+            rows.append(row)
+        return rows
+
+    def element_text(self, html, el_id):
+        el = self._parse(html).css_first(f'#{el_id}')
+        return el.text(separator=" ") if el else None
+
+
+BACKENDS = {
+    'selectolax': SelectolaxBackend,
+    'lxml': LxmlBackend,
+    'html.parser': BS4Backend,
+}
+
+_loaded = {}
+
+
+def available():
+    """Names of the backends whose libraries are installed, fastest first. Imports all of them."""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def get_backend(name=None):
+    """The configured backend (or a named one). Raises ImportError if it isn't installed."""
+    name = name or PARSER
+    if name == 'auto':
+        if 'auto' not in _loaded:
+            # First one that imports wins; the slower libraries are never loaded
+            for candidate in BACKENDS:
+                try:
+                    _loaded['auto'] = get_backend(candidate)
+                    break
+                except ImportError:
+                    continue
+            else:
+                raise ImportError("No HTML parser installed (need selectolax, lxml or beautifulsoup4)")
+        return _loaded['auto']
+    if name not in _loaded:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown parser backend {name!r}, pick one of {list(BACKENDS)}")
+        _loaded[name] = BACKENDS[name]()
+    return _loaded[name]
@@ -0,0 +1,64 @@
+import threading
+import time
+
+import metrics
+
+# requests is imported on first use, so cache-only commands (wr.py inspect) start fast
+
+# urllib3 only decodes brotli when the brotli package is around, so only ask for it then
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+POOL_SIZE = 8
+
+_local = threading.local()
+
+
+def session():
+    """
+    Pooled keep-alive session, one per thread.
+
+    Every request to PFR reuses the same TCP/TLS connection instead of paying
+    a fresh handshake per player. Sessions aren't guaranteed thread-safe, so
+    the fetcher's worker threads each get their own.
+    """
+    s = getattr(_local, "session", None)
+    if s is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_SIZE)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        s.headers.update(HEADERS)
+        _local.session = s
+    return s
+
+
+def get(url, headers=None, timeout=10, etag=None, last_modified=None):
+    """GET through the pooled session, as a conditional request when validators are given."""
+    headers = dict(headers or {})
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    start = time.perf_counter()
+    response = session().get(url, headers=headers, timeout=timeout)
+    seconds = time.perf_counter() - start
+
+    size = len(response.content)   # decoded body; the compressed wire size isn't exposed by requests
+    metrics.observe('wr_fetch_seconds', seconds)
+    metrics.inc('wr_fetch_body_bytes_total', size)
+    metrics.inc('wr_fetch_responses_total', status=response.status_code)
+    metrics.event('fetch', url=url, status=response.status_code, seconds=round(seconds, 4), bytes=size)
+    return response
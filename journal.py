@@ -0,0 +1,86 @@
+import json
+import os
+
+import metrics
+
+# === Append-only result journal ===
+# One JSON line per finished player, flushed and fsync'd before the loop moves
+# on. Checkpointing costs one small append instead of rewriting the whole CSV,
+# and a crash loses at most the player that was in flight. On restart the
+# journal says who's done and carries their results back into the frame.
+
+
+def _plain(value):
+    # numpy / pandas scalars (np.int64, np.bool_, ...) -> plain Python for json
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            # A crash mid-write can leave half a line behind; start ours on a fresh one
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b'\n'
+            else:
+                needs_newline = False
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if needs_newline:
+                self._file.write('\n')
+        return self._file
+
+    def append(self, record):
+        """Durably record one player's result."""
+        f = self._open()
+        f.write(json.dumps(record, default=_plain) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+        metrics.inc('wr_journal_records_total')
+
+    def records(self):
+        """Every intact record, oldest first (a torn last line is skipped)."""
+        if not os.path.exists(self.path):
+            return []
+        out = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    out.append(json.loads(line))
+                except ValueError:
+                    continue
+        return out
+
+    def latest(self):
+        """Most recent record per Player_ID."""
+        return {r['Player_ID']: r for r in self.records() if 'Player_ID' in r}
+
+    def player_ids(self):
+        return set(self.latest())
+
+    def apply(self, df):
+        """Copy journaled results into `df` (matched on Player_ID, in place) and return it."""
+        latest = self.latest()
+        columns = {k for r in latest.values() for k in r if k != 'Player_ID'}
+        for col in sorted(columns):
+            has = df['Player_ID'].map(lambda pid: col in latest.get(pid, ())).astype(bool)
+            if col not in df.columns:
+                df[col] = None
+            df[col] = df[col].astype(object)
+            df.loc[has, col] = df.loc[has, 'Player_ID'].map(lambda pid: latest[pid][col])
+        return df
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def reset(self):
+        """Forget everything, once the results are safely stored somewhere else."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,209 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# === Run metrics ===
+# Counters and histograms from every stage (fetch, cache, parse, extract,
+# score, store), kept in memory for the run and surfaced three ways:
+#   - one JSON line per notable event (fetches, 429s, retries, rows written) in LOG_FILE
+#   - a Prometheus textfile (PROM_FILE) rewritten when the run ends, for node_exporter
+#   - a summary at exit showing where the wall-clock time went, stage by stage
+# Stages can nest (store inside refresh, say). Only the outermost ones add up
+# to the wall clock; nested ones are listed indented but not counted twice.
+# Process-pool workers (parse_stage) keep their own copies, which are lost;
+# the parent still times the stage as a whole.
+
+ENABLED = os.environ.get("WR_METRICS", "1") != "0"
+LOG_FILE = os.environ.get("WR_METRICS_LOG", "metrics.jsonl")
+PROM_FILE = os.environ.get("WR_METRICS_PROM", "metrics.prom")
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HELP = {
+    'wr_cache_requests_total': "Page requests by cache outcome (hit, stale, revalidated, miss, offline_miss)",
+    'wr_fetch_seconds': "Network fetch latency",
+    'wr_fetch_body_bytes_total': "Decoded bytes of page bodies received (after gzip/br, not wire bytes)",
+    'wr_fetch_responses_total': "Network responses by HTTP status",
+    'wr_fetch_retries_total': "Fetch retries by reason",
+    'wr_rate_limited_total': "429 responses",
+    'wr_parse_seconds': "Time to turn a stats table into rows",
+    'wr_extract_seconds': "Time per extractor per page",
+    'wr_rows_written_total': "Rows written to the dataset store",
+    'wr_journal_records_total': "Records appended to checkpoint journals",
+    'wr_stage_seconds': "Wall-clock time per pipeline stage",
+}
+
+STARTED = time.time()
+
+_lock = threading.Lock()
+_counters = {}      # (name, labels) -> value
+_histograms = {}    # (name, labels) -> [bucket counts..., sum, count]
+_top = {}           # stage -> seconds spent in it while no other stage was running
+_depth = threading.local()
+_log = None
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    with _lock:
+        key = _key(name, labels)
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                hist[i] += 1
+        hist[-2] += value
+        hist[-1] += 1
+
+
+@contextmanager
+def timer(name, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def stage(name):
+    """Time a whole pipeline stage; shows up in the exit summary and as a 'stage' event."""
+    depth = getattr(_depth, 'value', 0)
+    _depth.value = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _depth.value = depth
+        observe('wr_stage_seconds', seconds, stage=name)
+        if not depth:
+            with _lock:
+                _top[name] = _top.get(name, 0) + seconds
+        event('stage', stage=name, seconds=round(seconds, 4), depth=depth)
+
+
+def event(name, **fields):
+    """One structured log line."""
+    global _log
+    if not ENABLED:
+        return
+    line = json.dumps({'ts': round(time.time(), 3), 'event': name, **fields}, default=str)
+    with _lock:
+        if _log is None:
+            _log = open(LOG_FILE, 'a', encoding='utf-8', buffering=1)
+        _log.write(line + '\n')
+
+
+# === Output ===
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+def prometheus():
+    """Everything recorded so far in Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+
+    lines, typed = [], set()
+
+    def header(name, kind):
+        if name not in typed:
+            typed.add(name)
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(counters.items()):
+        header(name, 'counter')
+        lines.append(f"{name}{_labels(labels)} {value}")
+    for (name, labels), hist in sorted(histograms.items()):
+        header(name, 'histogram')
+        for bound, count in zip(BUCKETS, hist):
+            lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {count}")
+        lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {hist[-1]}")
+        lines.append(f"{name}_sum{_labels(labels)} {hist[-2]}")
+        lines.append(f"{name}_count{_labels(labels)} {hist[-1]}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path=PROM_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        f.write(prometheus())
+    os.replace(tmp, path)
+
+
+def _total(store, name, **match):
+    return sum(v if store is _counters else v[-2]
+               for (n, labels), v in store.items()
+               if n == name and all(dict(labels).get(k) == m for k, m in match.items()))
+
+
+def summary():
+    """Where the wall-clock time went, plus the headline counters."""
+    wall = time.time() - STARTED
+    with _lock:
+        stages = {dict(labels)['stage']: hist[-2] for (name, labels), hist in _histograms.items()
+                  if name == 'wr_stage_seconds'}
+        top = dict(_top)
+        fetch_time = _total(_histograms, 'wr_fetch_seconds')
+        fetches = sum(h[-1] for (n, _), h in _histograms.items() if n == 'wr_fetch_seconds')
+        cache = {dict(labels)['result']: v for (name, labels), v in _counters.items()
+                 if name == 'wr_cache_requests_total'}
+        counts = {name: _total(_counters, name) for name in
+                  ('wr_fetch_body_bytes_total', 'wr_rate_limited_total', 'wr_fetch_retries_total',
+                   'wr_rows_written_total', 'wr_journal_records_total')}
+        parse_time = _total(_histograms, 'wr_parse_seconds')
+        extract_time = _total(_histograms, 'wr_extract_seconds')
+
+    lines = [f"📊 Run summary ({wall:.1f}s wall clock)"]
+    for name, seconds in sorted(stages.items(), key=lambda kv: -kv[1]):
+        # Nested stages are indented; their time is already inside an outer stage's
+        label = name if name in top else f"  {name}"
+        lines.append(f"   {label:20s} {seconds:9.2f}s  {seconds / max(wall, 1e-9):6.1%}")
+    if stages:
+        other = wall - sum(top.values())
+        lines.append(f"   {'(outside stages)':20s} {other:9.2f}s  {other / max(wall, 1e-9):6.1%}")
+    if fetches:
+        lines.append(f"   fetches: {fetches} ({fetch_time / fetches * 1000:.0f} ms avg), "
+                     f"{counts['wr_fetch_body_bytes_total'] / 1024 / 1024:.1f} MB decoded, "
+                     f"{counts['wr_rate_limited_total']} × 429, {counts['wr_fetch_retries_total']} retries")
+    requests = sum(cache.values())
+    if requests:
+        hits = cache.get('hit', 0) + cache.get('stale', 0) + cache.get('revalidated', 0)
+        lines.append(f"   cache: {hits}/{requests} served locally ({hits / requests:.0%}) {cache}")
+    if parse_time or extract_time:
+        lines.append(f"   parse {parse_time:.2f}s, extract {extract_time:.2f}s (this process)")
+    if counts['wr_rows_written_total'] or counts['wr_journal_records_total']:
+        lines.append(f"   rows written: {counts['wr_rows_written_total']}, "
+                     f"journaled: {counts['wr_journal_records_total']}")
+    return '\n'.join(lines)
+
+
+def _finish():
+    if not ENABLED or not (_counters or _histograms):
+        return
+    write_prometheus()
+    print(summary())
+
+
+atexit.register(_finish)
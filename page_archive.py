@@ -0,0 +1,538 @@
+import bisect
+import hashlib
+import mmap
+import os
+import random
+import struct
+import time
+import uuid
+from datetime import datetime, timezone
+
+import page_cache
+
+# === Page archive ===
+# Cached pages packed into one .warc.zst file. Each page is a WARC/1.1
+# 'response' record (WARC headers, the HTTP status line with ETag /
+# Last-Modified, then the HTML), compressed as its own zstd frame so any
+# record can be decompressed without the ones before it. Every frame uses a
+# dictionary trained on PFR pages: the nav, footer, scripts and table markup
+# they all share go in the dictionary once, instead of once per page the way
+# per-blob gzip stores them. The dictionary sits in a skippable frame at the
+# start of the file, as the .warc.zst convention has it, so the archive is
+# self-contained.
+#
+# An archive can hold several revisions of a page: append() adds only pages
+# whose body changed since the newest record for that URL, and compact()
+# rewrites the archive keeping the newest `keep` revisions (retraining the
+# dictionary on the way). Needs the zstandard package.
+#
+# Next to every archive sits an index (<archive>.idx): fixed-width entries
+# sorted by (player_id, fetched_at) giving each record's frame offset and
+# length (plus the body's digest, so append() can skip unchanged pages
+# without decompressing anything). Archive() memory-maps both files, so finding a page is a binary
+# search over the mapped index and reading it is one frame decompressed
+# straight out of the mapped archive. No per-page files, no copies, and
+# parse processes opening the same archive share the OS's pages.
+
+LEVEL = int(os.environ.get("WR_ARCHIVE_LEVEL", "19"))
+DICT_SIZE = 112 * 1024
+TRAIN_SAMPLES = 200            # ~100x the dictionary size is plenty; pages are big
+MIN_TRAIN_SAMPLES = 8          # zstd can't train on fewer; smaller archives go without a dictionary
+
+DICT_MAGIC = 0x184D2A5D        # skippable frame holding the dictionary
+READ_CHUNK = 1 << 20
+
+INDEX_MAGIC = b'WRIX'
+INDEX_HEADER = struct.Struct('<4sHQQ')   # magic, version, archive bytes indexed, entries
+INDEX_ENTRY = struct.Struct('<16sd32sQI')   # player_id (NUL-padded), fetched_at, sha256, offset, length
+INDEX_VERSION = 1
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("The page archive needs zstandard (pip install zstandard)") from None
+    return zstandard
+
+
+# === Records ===
+
+def _warc_date(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _timestamp(date):
+    return datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=timezone.utc).timestamp()
+
+
+def _headers(block):
+    lines = block.decode('utf-8').split('\r\n')
+    return lines[0], dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+
+
+def encode_record(page):
+    """A page_cache.iter_pages() dict -> one WARC response record (bytes)."""
+    body = page['html'].encode('utf-8')
+    http = "HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+    if page.get('etag'):
+        http += f"ETag: {page['etag']}\r\n"
+    if page.get('last_modified'):
+        http += f"Last-Modified: {page['last_modified']}\r\n"
+    block = (http + "\r\n").encode('utf-8') + body
+    head = ("WARC/1.1\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {_warc_date(page['fetched_at'])}\r\n"
+            f"WARC-Target-URI: {page['url']}\r\n"
+            f"WARC-Payload-Digest: sha256:{hashlib.sha256(body).hexdigest()}\r\n"
+            "Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(block)}\r\n"
+            "\r\n")
+    return head.encode('utf-8') + block + b"\r\n\r\n"
+
+
+def decode_record(data, check=False):
+    """
+    WARC record bytes -> dict with url, fetched_at, etag, last_modified, sha and html.
+
+    check=True raises ValueError if the block is short or the body doesn't
+    match its WARC-Payload-Digest.
+    """
+    head, _, rest = data.partition(b"\r\n\r\n")
+    _, warc = _headers(head)
+    block = rest[:int(warc['Content-Length'])]
+    http, _, body = block.partition(b"\r\n\r\n")
+    _, http_headers = _headers(http)
+    sha = warc['WARC-Payload-Digest'].split(':', 1)[1]
+    if check:
+        if len(block) != int(warc['Content-Length']):
+            raise ValueError(f"{warc['WARC-Target-URI']}: record truncated")
+        if hashlib.sha256(body).hexdigest() != sha:
+            raise ValueError(f"{warc['WARC-Target-URI']}: payload digest mismatch")
+    return {'url': warc['WARC-Target-URI'], 'fetched_at': _timestamp(warc['WARC-Date']),
+            'etag': http_headers.get('ETag'), 'last_modified': http_headers.get('Last-Modified'),
+            'sha': sha, 'html': body.decode('utf-8', errors='replace')}
+
+
+# === Dictionary ===
+
+def sample(records, n=TRAIN_SAMPLES, seed=0):
+    """Reservoir-sample n records from an iterable without holding the rest in memory."""
+    rng = random.Random(seed)
+    picked = []
+    for i, record in enumerate(records):
+        if i < n:
+            picked.append(record)
+        else:
+            j = rng.randrange(i + 1)
+            if j < n:
+                picked[j] = record
+    return picked
+
+
+def train_dictionary(samples, size=DICT_SIZE):
+    """A zstd dictionary trained on sample records, or None if there are too few."""
+    zstd = _zstd()
+    if len(samples) < MIN_TRAIN_SAMPLES:
+        return None
+    return zstd.train_dictionary(size, samples).as_bytes()
+
+
+def read_dictionary(f):
+    """The dictionary at the head of an open archive (None if it has none); leaves f after it."""
+    head = f.read(8)
+    if len(head) == 8:
+        magic, size = struct.unpack('<II', head)
+        if magic == DICT_MAGIC:
+            return f.read(size)
+    f.seek(0)
+    return None
+
+
+def _compressor(dictionary, level=LEVEL):
+    zstd = _zstd()
+    dict_data = zstd.ZstdCompressionDict(dictionary) if dictionary else None
+    return zstd.ZstdCompressor(level=level, dict_data=dict_data, write_checksum=True)
+
+
+def _decompressor(dictionary):
+    zstd = _zstd()
+    return zstd.ZstdDecompressor(dict_data=zstd.ZstdCompressionDict(dictionary) if dictionary else None)
+
+
+# === Reading ===
+
+def iter_frames(path):
+    """Yield (offset, compressed length, record bytes) for every record in an archive."""
+    with open(path, 'rb') as f:
+        dctx = _decompressor(read_dictionary(f))
+        offset = f.tell()
+        pending = b''
+        while True:
+            if not pending:
+                pending = f.read(READ_CHUNK)
+                if not pending:
+                    return
+            obj = dctx.decompressobj()
+            out, used = [], 0
+            while True:
+                out.append(obj.decompress(pending))
+                if obj.eof:
+                    used += len(pending) - len(obj.unused_data)
+                    pending = obj.unused_data
+                    break
+                used += len(pending)
+                pending = f.read(READ_CHUNK)
+                if not pending:
+                    raise ValueError(f"{path}: archive ends mid-record at offset {offset}")
+            yield offset, used, b''.join(out)
+            offset += used
+
+
+def iter_records(path, check=False):
+    """Every record in file order (oldest revisions first within a build/append)."""
+    for _, _, data in iter_frames(path):
+        yield decode_record(data, check)
+
+
+def latest(path):
+    """{url: newest record} across every revision in the archive."""
+    newest = {}
+    for record in iter_records(path):
+        kept = newest.get(record['url'])
+        if kept is None or record['fetched_at'] >= kept['fetched_at']:
+            newest[record['url']] = record
+    return newest
+
+
+# === Writing ===
+
+def _write_frames(f, cctx, records, entries):
+    """Append compressed records to an open file, noting index entries. Returns (records, raw bytes)."""
+    count = raw = 0
+    for record in records:
+        frame = cctx.compress(record)
+        entry = _entry(record, f.tell(), len(frame))
+        if entry:
+            entries.append(entry)
+        f.write(frame)
+        count += 1
+        raw += len(record)
+    f.flush()
+    os.fsync(f.fileno())
+    return count, raw
+
+
+def _write(path, records, dictionary, level=LEVEL):
+    """Write records (any iterable) to a fresh archive and its index atomically. Returns (records, raw bytes)."""
+    cctx = _compressor(dictionary, level)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    entries = []
+    with open(tmp, 'wb') as f:
+        if dictionary:
+            f.write(struct.pack('<II', DICT_MAGIC, len(dictionary)))
+            f.write(dictionary)
+        count, raw = _write_frames(f, cctx, records, entries)
+    os.replace(tmp, path)
+    write_index(path, entries)
+    return count, raw
+
+
+def build(path, kind='player', level=LEVEL):
+    """Pack every cached page of `kind` (None: all kinds) into a new archive at `path`."""
+    # Two passes over the cache: one to sample for the dictionary, one to write
+    dictionary = train_dictionary(sample(encode_record(page) for page in page_cache.iter_pages(kind)))
+    count, raw = _write(path, (encode_record(page) for page in page_cache.iter_pages(kind)),
+                        dictionary, level)
+    return {'records': count, 'raw_bytes': raw, 'dict_bytes': len(dictionary or b''),
+            'archive_bytes': os.path.getsize(path)}
+
+
+def append(path, kind='player', level=LEVEL):
+    """Add the cached pages whose body changed since the archive's newest record for them."""
+    if not os.path.exists(path):
+        return build(path, kind, level)
+    entries = read_index(path)
+    if entries is None:
+        entries = scan_index(path)
+    with Archive(path) as archive:
+        if kind == 'player':
+            seen = {url: archive.digest(_page_id(url)) for url in page_cache.cached_urls(kind)}
+        else:
+            seen = {url: record['sha'] for url, record in latest(path).items()}
+        cctx = _compressor(archive.dictionary, level)
+
+    with open(path, 'ab') as f:
+        new = (encode_record(page) for page in page_cache.iter_pages(kind)
+               if seen.get(page['url']) != page['sha'])
+        count, raw = _write_frames(f, cctx, new, entries)
+    write_index(path, entries)
+    return {'records': count, 'raw_bytes': raw, 'archive_bytes': os.path.getsize(path)}
+
+
+def compact(path, keep=1, retrain=True, level=LEVEL):
+    """
+    Rewrite an archive with the newest `keep` distinct revisions of each URL.
+
+    Records that fail verification are dropped. A damaged frame hides everything
+    after it (as verify() reports), so that tail is dropped too and counted in
+    'unreadable_bytes'. retrain=True trains a fresh dictionary on what's left,
+    which is worth it after the site's markup moves.
+    """
+    revisions, dropped, unreadable = {}, 0, 0
+    with open(path, 'rb') as f:
+        read_dictionary(f)
+        end = f.tell()
+    try:
+        for offset, length, data in iter_frames(path):
+            end = offset + length
+            try:
+                record = decode_record(data, check=True)
+            except (ValueError, KeyError):
+                dropped += 1
+                continue
+            revisions.setdefault(record['url'], []).append((record['fetched_at'], record['sha'], offset, length))
+    except (ValueError, _zstd().ZstdError):
+        unreadable = os.path.getsize(path) - end
+
+    kept = []
+    for url, versions in revisions.items():
+        versions.sort(reverse=True)
+        shas = set()
+        for fetched_at, sha, offset, length in versions:
+            if sha in shas:
+                continue
+            shas.add(sha)
+            kept.append((url, fetched_at, offset, length))
+            if len(shas) == keep:
+                break
+    kept.sort()
+    before = os.path.getsize(path)
+
+    with open(path, 'rb') as f:
+        old_dictionary = read_dictionary(f)
+        dctx = _decompressor(old_dictionary)
+
+        def records():
+            for _, _, offset, length in kept:
+                f.seek(offset)
+                yield dctx.decompress(f.read(length))
+
+        dictionary = train_dictionary(sample(records())) if retrain else old_dictionary
+        count, raw = _write(path, records(), dictionary, level)
+    return {'records': count, 'dropped': dropped, 'unreadable_bytes': unreadable, 'raw_bytes': raw,
+            'bytes_before': before, 'archive_bytes': os.path.getsize(path)}
+
+
+def verify(path):
+    """Decompress and check every record. Returns counts, sizes and decompression speed."""
+    gzip_sizes = page_cache.blob_sizes()
+    stats = {'records': 0, 'bad': [], 'raw_bytes': 0, 'gzip_bytes': 0, 'gzip_records': 0}
+    start = time.perf_counter()
+    try:
+        for offset, _, data in iter_frames(path):
+            stats['records'] += 1
+            stats['raw_bytes'] += len(data)
+            try:
+                record = decode_record(data, check=True)
+            except (ValueError, KeyError) as e:
+                stats['bad'].append((offset, str(e)))
+                continue
+            if record['sha'] in gzip_sizes:
+                stats['gzip_bytes'] += gzip_sizes[record['sha']]
+                stats['gzip_records'] += 1
+    except (ValueError, _zstd().ZstdError) as e:
+        # A damaged frame: nothing after it can be found without an index
+        stats['bad'].append((None, f"unreadable after record {stats['records']}: {e}"))
+    seconds = time.perf_counter() - start
+    stats['archive_bytes'] = os.path.getsize(path)
+    stats['us_per_record'] = round(seconds / max(stats['records'], 1) * 1e6, 1)
+    stats['mb_per_s'] = round(stats['raw_bytes'] / 1024 / 1024 / max(seconds, 1e-9), 1)
+    return stats
+
+
+# === Index ===
+
+def _page_id(url):
+    """The index key for a url: the player ID for player pages, else None (not indexed)."""
+    if page_cache.page_kind(url) != 'player':
+        return None
+    return url.rsplit('/', 1)[-1].split('.')[0]
+
+
+def _entry(record, offset, length):
+    """(key, fetched_at, sha, offset, length) for a record about to be written, or None if it isn't indexed."""
+    head = record[:record.index(b"\r\n\r\n")]
+    _, warc = _headers(head)
+    player_id = _page_id(warc['WARC-Target-URI'])
+    if player_id is None:
+        return None
+    sha = bytes.fromhex(warc['WARC-Payload-Digest'].split(':', 1)[1])
+    return player_id.encode('ascii'), _timestamp(warc['WARC-Date']), sha, offset, length
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+def write_index(path, entries):
+    """Sort entries by (player_id, fetched_at) and write them next to the archive atomically."""
+    entries = sorted(entries)
+    tmp = f"{index_path(path)}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, os.path.getsize(path), len(entries)))
+        for entry in entries:
+            f.write(INDEX_ENTRY.pack(*entry))
+    os.replace(tmp, index_path(path))
+
+
+def index_current(path):
+    """Whether the .idx exists and was written for the archive as it is now (header only)."""
+    try:
+        with open(index_path(path), 'rb') as f:
+            header = f.read(INDEX_HEADER.size)
+    except FileNotFoundError:
+        return False
+    if len(header) < INDEX_HEADER.size:
+        return False
+    magic, version, size, _ = INDEX_HEADER.unpack(header)
+    return magic == INDEX_MAGIC and version == INDEX_VERSION and size == os.path.getsize(path)
+
+
+def read_index(path):
+    """The archive's index entries, or None if there's no current index."""
+    if not index_current(path):
+        return None
+    with open(index_path(path), 'rb') as f:
+        data = f.read()
+    return [(key.rstrip(b'\0'), *rest) for key, *rest in INDEX_ENTRY.iter_unpack(data[INDEX_HEADER.size:])]
+
+
+def scan_index(path):
+    """Rebuild the index entries by reading every frame (for archives without a usable .idx)."""
+    entries = []
+    for offset, length, data in iter_frames(path):
+        entry = _entry(data, offset, length)
+        if entry:
+            entries.append(entry)
+    write_index(path, entries)
+    return entries
+
+
+class _Keys:
+    """The mapped index as a sorted sequence of (player_id, fetched_at), for bisect."""
+
+    def __init__(self, index, count):
+        self.index = index
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return INDEX_ENTRY.unpack_from(self.index, INDEX_HEADER.size + i * INDEX_ENTRY.size)[:2]
+
+
+class Archive:
+    """
+    Random access to player pages in an archive, both files memory-mapped.
+
+        with Archive('pages.warc.zst') as archive:
+            html = archive.get('HopkDe00')                  # newest revision
+            old = archive.get('HopkDe00', before=ts)        # as it was at time ts
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if not index_current(path):
+            scan_index(path)
+        self._file = open(path, 'rb')
+        self.dictionary = read_dictionary(self._file)
+        # mmap can't map an empty file (an archive of zero records with no dictionary)
+        self._data = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                      if os.path.getsize(path) else mmap.mmap(-1, 1))
+        with open(index_path(path), 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = INDEX_HEADER.unpack_from(self._index)[3]
+        self._keys = _Keys(self._index, self._count)
+        self._dctx = _decompressor(self.dictionary)
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, player_id, before=None):
+        """The newest index entry for player_id at or before `before`, or None."""
+        if not player_id:
+            return None
+        key = player_id.encode('ascii').ljust(16, b'\0')
+        i = bisect.bisect_right(self._keys, (key, float('inf') if before is None else before)) - 1
+        if i < 0 or self._keys[i][0] != key:
+            return None
+        return INDEX_ENTRY.unpack_from(self._index, INDEX_HEADER.size + i * INDEX_ENTRY.size)
+
+    def __contains__(self, player_id):
+        return self._entry(player_id) is not None
+
+    def digest(self, player_id, before=None):
+        """sha256 of the archived body (hex), straight from the index; None if it isn't archived."""
+        entry = self._entry(player_id, before)
+        return None if entry is None else entry[2].hex()
+
+    def revisions(self, player_id):
+        """fetched_at of every stored revision of a player's page, oldest first."""
+        key = player_id.encode('ascii').ljust(16, b'\0')
+        i = bisect.bisect_left(self._keys, (key, float('-inf')))
+        out = []
+        while i < self._count and self._keys[i][0] == key:
+            out.append(self._keys[i][1])
+            i += 1
+        return out
+
+    def player_ids(self):
+        """Every indexed player, sorted."""
+        ids = []
+        for i in range(self._count):
+            key = self._keys[i][0].rstrip(b'\0').decode('ascii')
+            if not ids or ids[-1] != key:
+                ids.append(key)
+        return ids
+
+    def raw(self, player_id, before=None):
+        """The WARC record bytes for a player's page (None if it isn't archived)."""
+        entry = self._entry(player_id, before)
+        if entry is None:
+            return None
+        offset, length = entry[3:]
+        # A memoryview slice of the mapping: the compressed frame is never copied
+        return self._dctx.decompress(memoryview(self._data)[offset:offset + length])
+
+    def record(self, player_id, before=None):
+        data = self.raw(player_id, before)
+        return None if data is None else decode_record(data)
+
+    def get(self, player_id, before=None):
+        """A player's page HTML: the newest revision, or the newest fetched at or before `before`."""
+        record = self.record(player_id, before)
+        return None if record is None else record['html']
+
+    def close(self):
+        self._index.close()
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_open = {}
+
+
+def open_archive(path):
+    """A per-process shared Archive for `path` (the parse stage's workers each keep one)."""
+    if path not in _open:
+        _open[path] = Archive(path)
+    return _open[path]
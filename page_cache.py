@@ -0,0 +1,324 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+import http_client
+import metrics
+
+# === Settings (override with env vars) ===
+CACHE_DIR = os.environ.get("WR_CACHE_DIR", ".page_cache")
+MAX_CACHE_BYTES = int(os.environ.get("WR_CACHE_MAX_MB", "2048")) * 1024 * 1024
+OFFLINE = os.environ.get("WR_OFFLINE", "") == "1"
+
+DAY = 24 * 60 * 60
+TTLS = {
+    'player': 7 * DAY,    # career tables only change once a week in season
+    'draft': 90 * DAY,    # draft pages are basically frozen
+    'directory': 30 * DAY,  # /players/{letter}/ only grows when rookies debut
+    'other': 1 * DAY,
+}
+
+# Point at a local stand-in (stub_server.py) with WR_BASE_URL=http://127.0.0.1:8000
+BASE_URL = os.environ.get("WR_BASE_URL", "https://www.pro-football-reference.com")
+
+
+def player_url(player_id):
+    return f"{BASE_URL}/players/{player_id[0]}/{player_id}.htm"
+
+
+def draft_url(year):
+    return f"{BASE_URL}/years/{year}/draft.htm"
+
+
+def directory_url(letter):
+    return f"{BASE_URL}/players/{letter.upper()}/"
+
+
+def page_kind(url):
+    if url.endswith("/") and "/players/" in url:
+        return 'directory'
+    if "/players/" in url:
+        return 'player'
+    if "/draft.htm" in url:
+        return 'draft'
+    return 'other'
+
+
+class CachedResponse:
+    """Just enough of requests.Response for the scrapers: status_code, ok, text."""
+
+    def __init__(self, status_code, text="", headers=None, from_cache=False):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+
+# === Storage ===
+# Pages are stored content-addressed (sha256 of the body) as gzip blobs under
+# objects/, so a re-fetch of an unchanged page costs no extra disk. The SQLite
+# index maps url -> blob plus the timestamps used for TTLs and LRU eviction.
+
+@contextmanager
+def _db():
+    """Open the cache index, commit on success and always close the handle."""
+    os.makedirs(os.path.join(CACHE_DIR, "objects"), exist_ok=True)
+    conn = sqlite3.connect(os.path.join(CACHE_DIR, "index.db"), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pages (
+            url TEXT PRIMARY KEY,
+            sha TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            etag TEXT,
+            last_modified TEXT
+        )""")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS blobs (
+            sha TEXT PRIMARY KEY,
+            size INTEGER NOT NULL
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS pages_sha ON pages (sha)")
+    conn.execute("CREATE INDEX IF NOT EXISTS pages_lru ON pages (last_access)")
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _blob_path(sha):
+    return os.path.join(CACHE_DIR, "objects", sha[:2], sha[2:] + ".gz")
+
+
+def _read_blob(sha):
+    try:
+        with gzip.open(_blob_path(sha), "rb") as f:
+            return f.read().decode("utf-8")
+    except (OSError, EOFError):
+        return None
+
+
+def store(url, text, headers=None):
+    """Save a page body in the cache and point `url` at it."""
+    headers = headers or {}
+    body = text.encode("utf-8")
+    sha = hashlib.sha256(body).hexdigest()
+    path = _blob_path(sha)
+
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A temp name of our own: fetcher threads can store the same body at once
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                f.write(body)
+            os.replace(tmp, path)  # atomic, so readers never see half a blob
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    now = time.time()
+    with _db() as conn:
+        conn.execute("INSERT OR REPLACE INTO blobs (sha, size) VALUES (?, ?)",
+                     (sha, os.path.getsize(path)))
+        conn.execute(
+            "INSERT OR REPLACE INTO pages (url, sha, fetched_at, last_access, etag, last_modified) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, sha, now, now, headers.get("ETag"), headers.get("Last-Modified")))
+    evict()
+    return sha
+
+
+def lookup(url):
+    """Return the index row for `url` as a dict, or None if it was never cached."""
+    with _db() as conn:
+        row = conn.execute(
+            "SELECT sha, fetched_at, etag, last_modified FROM pages WHERE url = ?",
+            (url,)).fetchone()
+    if not row:
+        return None
+    return {'sha': row[0], 'fetched_at': row[1], 'etag': row[2], 'last_modified': row[3]}
+
+
+def is_fresh(url, ttl=None):
+    """True if `url` was fetched within `ttl` seconds (its kind's TTL by default). Index only, no blob read."""
+    entry = lookup(url)
+    ttl = TTLS[page_kind(url)] if ttl is None else ttl
+    return entry is not None and time.time() - entry['fetched_at'] <= ttl
+
+
+def _load(url, entry, touch=True):
+    """Read the blob behind an index entry and bump its LRU timestamp."""
+    text = _read_blob(entry['sha'])
+    if text is not None and touch:
+        with _db() as conn:
+            conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+    return text
+
+
+def get_cached(url, ttl=None, touch=True):
+    """
+    Cached body for `url`, or None if missing (or older than `ttl` seconds).
+
+    Bulk readers like the parse stage pass touch=False so reading 20k pages
+    doesn't turn into 20k LRU writes to the index.
+    """
+    entry = lookup(url)
+    if not entry:
+        return None
+    if ttl is not None and time.time() - entry['fetched_at'] > ttl:
+        return None
+    return _load(url, entry, touch)
+
+
+def revalidated(url, headers=None):
+    """A 304 came back: the cached body is current again, so restart its TTL."""
+    headers = headers or {}
+    now = time.time()
+    with _db() as conn:
+        conn.execute(
+            "UPDATE pages SET fetched_at = ?, last_access = ?, "
+            "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+            (now, now, headers.get("ETag"), headers.get("Last-Modified"), url))
+
+
+def evict(max_bytes=None):
+    """Drop least-recently-used pages until the blob store fits under `max_bytes`."""
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    removed = 0
+    with _db() as conn:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+
+        lru = conn.execute("SELECT url, sha FROM pages ORDER BY last_access").fetchall()
+        for url, sha in lru:
+            if total <= max_bytes:
+                break
+            conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            removed += 1
+
+            # A blob can be shared by several urls; only free it once it's orphaned
+            if conn.execute("SELECT 1 FROM pages WHERE sha = ?", (sha,)).fetchone():
+                continue
+            size = conn.execute("SELECT size FROM blobs WHERE sha = ?", (sha,)).fetchone()
+            conn.execute("DELETE FROM blobs WHERE sha = ?", (sha,))
+            try:
+                os.remove(_blob_path(sha))
+            except FileNotFoundError:
+                pass
+            total -= size[0] if size else 0
+    return removed
+
+
+def cached_urls(kind=None):
+    """Every url in the cache, optionally only one page kind ('player', 'draft', 'other')."""
+    with _db() as conn:
+        urls = [row[0] for row in conn.execute("SELECT url FROM pages ORDER BY url")]
+    return [u for u in urls if kind is None or page_kind(u) == kind]
+
+
+def iter_pages(kind=None):
+    """Every cached page as a dict (lookup()'s fields plus url and html), skipping missing blobs."""
+    with _db() as conn:
+        rows = conn.execute(
+            "SELECT url, sha, fetched_at, etag, last_modified FROM pages ORDER BY url").fetchall()
+    for url, sha, fetched_at, etag, last_modified in rows:
+        if kind is not None and page_kind(url) != kind:
+            continue
+        html = _read_blob(sha)
+        if html is not None:
+            yield {'url': url, 'sha': sha, 'fetched_at': fetched_at, 'etag': etag,
+                   'last_modified': last_modified, 'html': html}
+
+
+def blob_sizes():
+    """{sha: gzip bytes on disk} for every blob, for comparing against other storage."""
+    with _db() as conn:
+        return dict(conn.execute("SELECT sha, size FROM blobs"))
+
+
+def fetched_times(urls):
+    """{url: fetched_at} for whichever of `urls` are cached, from one index scan."""
+    wanted = set(urls)
+    with _db() as conn:
+        return {url: fetched for url, fetched in conn.execute("SELECT url, fetched_at FROM pages")
+                if url in wanted}
+
+
+def cache_stats():
+    with _db() as conn:
+        pages = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        blobs, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+    return {'pages': pages, 'blobs': blobs, 'bytes': size}
+
+
+# === Fetching ===
+
+_network_requests = 0
+_slept_at = 0
+
+
+def cached_get(url, headers=None, timeout=10, ttl=None, offline=None, force=False):
+    """
+    Drop-in for requests.get() that serves PFR pages from the on-disk cache.
+
+    Fresh cache hits never touch the network. Stale (or forced) pages are
+    revalidated with If-None-Match / If-Modified-Since, so an unchanged page
+    costs a bodiless 304 rather than a full download. In offline mode
+    (WR_OFFLINE=1) stale pages are served too, and a miss comes back as a 504
+    instead of a request, the same way a browser answers `only-if-cached`.
+    """
+    global _network_requests
+    offline = OFFLINE if offline is None else offline
+    ttl = TTLS[page_kind(url)] if ttl is None else ttl
+
+    entry = lookup(url)
+    if entry and not force and (offline or time.time() - entry['fetched_at'] <= ttl):
+        text = _load(url, entry)
+        if text is not None:
+            fresh = time.time() - entry['fetched_at'] <= ttl
+            metrics.inc('wr_cache_requests_total', result='hit' if fresh else 'stale')
+            return CachedResponse(200, text, from_cache=True)
+
+    if offline:
+        metrics.inc('wr_cache_requests_total', result='offline_miss')
+        return CachedResponse(504)
+
+    _network_requests += 1
+    response = http_client.get(url, headers=headers, timeout=timeout,
+                               etag=entry and entry['etag'],
+                               last_modified=entry and entry['last_modified'])
+
+    if response.status_code == 304 and entry:
+        text = _load(url, entry)
+        if text is not None:
+            revalidated(url, response.headers)
+            metrics.inc('wr_cache_requests_total', result='revalidated')
+            return CachedResponse(200, text, response.headers, from_cache=True)
+        # The blob went missing under us, so the 304 is useless; fetch it properly
+        response = http_client.get(url, headers=headers, timeout=timeout)
+
+    metrics.inc('wr_cache_requests_total', result='miss')
+    if response.status_code == 200:
+        store(url, response.text, response.headers)
+    return CachedResponse(response.status_code, response.text, response.headers)
+
+
+def polite_sleep(seconds):
+    """time.sleep() that only waits if a real request went out since the last call."""
+    global _slept_at
+    if _network_requests == _slept_at:
+        return
+    _slept_at = _network_requests
+    time.sleep(seconds)
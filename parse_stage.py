@@ -0,0 +1,158 @@
+import argparse
+import gzip
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import dataset_store
+import metrics
+import page_archive
+import page_cache
+import season_facts
+from player_page import PlayerPage, extract
+
+# === Parse stage ===
+# Re-runs the extractors over pages that are already on disk, fanned out over
+# every core. No network, no sleeps: fetching (fetcher.py) and parsing are
+# separate stages, so changing extractor logic only costs a re-parse.
+
+PAGE_SUFFIXES = ('.htm', '.html', '.htm.gz', '.html.gz')
+
+
+def _player_id(name):
+    return os.path.basename(name).split('.')[0]
+
+
+def _is_page(name):
+    return name.endswith(PAGE_SUFFIXES)
+
+
+def _decode(data, name):
+    if name.endswith('.gz'):
+        data = gzip.decompress(data)
+    return data.decode('utf-8', errors='replace')
+
+
+def iter_tasks(source=None):
+    """
+    Work items for the pool, cheapest form first.
+
+    None means the page cache: workers get just the url and read the blob
+    themselves. A .warc.zst (page_archive) gets player IDs, and each worker
+    reads the newest revision out of its own mapping of the archive. A
+    directory gets file paths. Other archives (.tar/.tar.gz/.zip) are read here
+    once and the page bodies are shipped to the workers.
+    """
+    if source is None:
+        for url in page_cache.cached_urls('player'):
+            yield ('cache', url)
+    elif os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if _is_page(name):
+                    yield ('file', os.path.join(root, name))
+    elif source.endswith('.warc.zst'):
+        for player_id in page_archive.open_archive(source).player_ids():
+            yield ('archive', (source, player_id))
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            for name in zf.namelist():
+                if _is_page(name):
+                    yield ('html', (name, _decode(zf.read(name), name)))
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as tf:
+            for member in tf:
+                if member.isfile() and _is_page(member.name):
+                    yield ('html', (member.name, _decode(tf.extractfile(member).read(), member.name)))
+    else:
+        raise ValueError(f"Don't know how to read pages from {source}")
+
+
+def load_task(task):
+    """(name, html) for a work item; html is None if a cached page has gone missing."""
+    kind, payload = task
+    if kind == 'cache':
+        return payload, page_cache.get_cached(payload, touch=False)
+    if kind == 'archive':
+        path, player_id = payload
+        return player_id, page_archive.open_archive(path).get(player_id)
+    if kind == 'file':
+        with open(payload, 'rb') as f:
+            return payload, _decode(f.read(), payload)
+    return payload
+
+
+def parse_one(task, extractors=None):
+    """One page -> (record, season fact rows), both from a single parse."""
+    name, html = load_task(task)
+    player_id = _player_id(name)
+    if html is None:
+        return {'Player_ID': player_id, 'Note': 'Missing from cache'}, []
+    try:
+        page = PlayerPage(player_id, html)
+        return extract(page, extractors), season_facts.season_rows(page)
+    except Exception as e:
+        return {'Player_ID': player_id, 'Note': f'Parse error: {e}'}, []
+
+
+def _parse_chunk(args):
+    tasks, extractors = args
+    return [parse_one(task, extractors) for task in tasks]
+
+
+def _chunks(tasks, size):
+    chunk = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_all(source=None, workers=None, chunksize=64, extractors=None):
+    """Parse every page in `source` across a process pool. Returns (one record per page, all season rows)."""
+    workers = workers or os.cpu_count()
+    jobs = ((chunk, extractors) for chunk in _chunks(iter_tasks(source), chunksize))
+    records, seasons = [], []
+    with metrics.stage('parse'), ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in pool.map(_parse_chunk, jobs):
+            for record, rows in batch:
+                records.append(record)
+                seasons.extend(rows)
+    return records, seasons
+
+
+def merge_into(table, records):
+    """Upsert parsed records into a store table, only for players already in it."""
+    known = dataset_store.load(['Player_ID'], table=table)['Player_ID']
+    parsed = pd.DataFrame(records)
+    parsed = parsed[parsed['Player_ID'].isin(known)]
+    if parsed.empty:
+        return 0
+    return dataset_store.upsert(parsed, table=table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-extract stats from already-fetched player pages.")
+    parser.add_argument("source", nargs="?", help="directory, .warc.zst or .tar/.zip of pages (default: the page cache)")
+    parser.add_argument("--table", default="players", help="dataset_store table to update")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--only", nargs="*", help="run just these extractors")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records, seasons = parse_all(args.source, workers=args.workers, extractors=args.only)
+    elapsed = time.perf_counter() - start
+    print(f"⚙️ Parsed {len(records)} pages in {elapsed:.1f}s ({len(records) / max(elapsed, 1e-9):.0f} pages/s)")
+
+    updated = merge_into(args.table, records)
+    print(f"✅ Updated {updated} players in {dataset_store.path(args.table)}")
+
+    stored = season_facts.save_seasons(seasons)
+    print(f"📅 Stored {stored} player-seasons in {dataset_store.path(season_facts.TABLE)}")
@@ -0,0 +1,152 @@
+import json
+import os
+
+import dataset_store
+import freshness
+import metrics
+import page_cache
+import season_facts
+from fetcher import prefetch_players
+from journal import Journal
+from parse_stage import load_task, parse_one
+from player_page import PlayerPage
+
+# === Enrich pipeline ===
+# The one job every scrape_wr_full* / batch_scrape_* / *_test script was a
+# variant of: pick the players due a fetch (freshness.py), warm the page cache for
+# them through the rate limiter, then run the extractors over the cached pages
+# and store the results (career columns in players, seasons in the fact table).
+# Each parsed player is journaled first, so a crash between parse and store
+# loses nothing; the next run flushes the journal before starting.
+
+JOURNAL = "wr_pipeline.journal.jsonl"
+CHANGES = "season_changes.jsonl"   # delta refresh output; `wr.py score --changed` consumes it
+
+
+def pending_players(force=False, player_ids=None):
+    """Player IDs to (re)scrape: the given ones, or whoever the scheduler says is due (everyone if forced)."""
+    if player_ids:
+        return list(player_ids)
+    return freshness.due(force)
+
+
+def _flush(journal, seasons=()):
+    """Store journaled records (and any season rows), then drop the journal."""
+    import pandas as pd
+
+    records = list(journal.latest().values())
+    if records:
+        dataset_store.upsert(pd.DataFrame(records))
+    season_facts.save_seasons(list(seasons))
+    journal.reset()
+    return len(records)
+
+
+def enrich(player_ids=None, limit=None, force=False, extractors=None, fetch=True):
+    """Scrape and store the pending players. Returns {'parsed': n, 'missing': [ids not fetched]}."""
+    journal = Journal(JOURNAL)
+    recovered = _flush(journal)
+    if recovered:
+        print(f"♻️ Stored {recovered} players left in the journal by the last run")
+
+    pending = pending_players(force, player_ids)[:limit]
+    if not pending:
+        print("✅ Nothing due (retired careers are skipped; --force to refetch them).")
+        return {'parsed': 0, 'missing': []}
+
+    if fetch:
+        prefetch_players(pending)
+
+    seasons, missing = [], []
+    for i, player_id in enumerate(pending, 1):
+        record, rows = parse_one(('cache', page_cache.player_url(player_id)), extractors)
+        if record.get('Note') == 'Missing from cache':
+            # Not fetched this run (429s, errors); it's still pending next time
+            missing.append(player_id)
+            continue
+        record['Player_ID'] = player_id
+        journal.append(record)
+        seasons.extend(rows)
+        print(f"🔍 {i}/{len(pending)}: {player_id} {record.get('Note')}")
+
+    parsed = _flush(journal, seasons)
+    freshness.record([pid for pid in pending if pid not in missing], freshness.last_seasons(seasons))
+    print(f"✅ Stored {parsed} players in {dataset_store.path()}"
+          + (f", {len(missing)} not fetched (rerun to retry)" if missing else ""))
+    return {'parsed': parsed, 'missing': missing}
+
+
+# === In-season delta refresh ===
+# For active players only the current season's line on the page moves week to
+# week. refresh_season() refetches them, parses just the seasons table (no
+# extractors), and stores only the current-season rows that differ from the
+# fact table. Players whose stored seasons don't cover their page yet get the
+# whole page saved instead. Career columns are rebuilt from the facts for the
+# changed players alone (never lowering a stored total), and each change is
+# appended to CHANGES so scoring can follow suit.
+
+def refresh_season(player_ids=None, season=None, fetch=True):
+    """Delta-refresh `season` (default: the current one). Returns the Player_IDs that changed."""
+    season = season or freshness.nfl_season()
+    if not player_ids:
+        due = freshness.schedule()
+        player_ids = due.loc[due['Due'] & (due['Status'] == 'active'), 'Player_ID'].tolist()
+    if not player_ids:
+        print("✅ No active players due a refresh.")
+        return []
+
+    if fetch:
+        prefetch_players(player_ids)
+
+    rows, parsed = [], []
+    with metrics.stage('parse'):
+        for player_id in player_ids:
+            _, html = load_task(('cache', page_cache.player_url(player_id)))
+            if html is None:
+                continue
+            try:
+                rows.extend(season_facts.season_rows(PlayerPage(player_id, html)))
+            except Exception as e:
+                print(f"⚠️ {player_id}: {e}")
+                continue
+            parsed.append(player_id)
+
+    # Players whose stored career is incomplete get every parsed season, not just the delta
+    backfill = season_facts.uncovered(rows)
+    season_facts.save_seasons([row for row in rows if row['Player_ID'] in backfill])
+    delta = [(row, columns) for row, columns in season_facts.season_delta(rows, season)
+             if row['Player_ID'] not in backfill]
+    changed = season_facts.save_delta(delta) + backfill
+
+    if changed:
+        facts = season_facts.load_seasons()
+        careers = season_facts.career_metrics(facts[facts['Player_ID'].isin(changed)])
+        # A refresh can only add games; a lower total means the facts are wrong, so leave it be
+        current = dataset_store.load(['Player_ID'] + season_facts.CAREER_TOTALS)
+        shrunk = season_facts.shrunk(careers, current)
+        for player_id in shrunk:
+            print(f"⚠️ {player_id}: rebuilt career totals are lower than stored ones, not overwriting")
+        dataset_store.upsert(careers[~careers['Player_ID'].isin(shrunk)])
+        with open(CHANGES, 'a', encoding='utf-8') as f:
+            for row, columns in delta:
+                f.write(json.dumps({'Player_ID': row['Player_ID'], 'season': season,
+                                    'columns': columns}) + '\n')
+            for player_id in backfill:
+                f.write(json.dumps({'Player_ID': player_id, 'season': None, 'columns': ['*']}) + '\n')
+    freshness.record(parsed, freshness.last_seasons(rows))
+    print(f"✅ {season}: {len(changed)} of {len(parsed)} players changed"
+          + (f" (listed in {CHANGES})" if changed else ""))
+    return changed
+
+
+def pending_changes():
+    """Player IDs the delta refreshes have changed since scoring last caught up."""
+    if not os.path.exists(CHANGES):
+        return []
+    with open(CHANGES, encoding='utf-8') as f:
+        return list(dict.fromkeys(json.loads(line)['Player_ID'] for line in f if line.strip()))
+
+
+def clear_changes():
+    if os.path.exists(CHANGES):
+        os.remove(CHANGES)
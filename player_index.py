@@ -0,0 +1,127 @@
+import difflib
+import re
+import string
+import unicodedata
+
+import pandas as pd
+
+import dataset_store
+from fetcher import fetch_many
+from page_cache import directory_url, get_cached
+
+# === Player-ID index ===
+# Every known Player_ID with its name, position, active years and (when
+# drafted) draft year and college, stored as the "player_index" table. Built
+# from the ingested draft pages plus PFR's /players/{letter}/ directory pages,
+# so names resolve to IDs offline. No more guessing last[:4] + first[:2] + "00"
+# and burning a request on every 404 or name collision (…01, …02).
+
+TABLE = 'player_index'
+FUZZY_CUTOFF = 0.85
+
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# <p><b><a href="/players/H/HopkDe00.htm">DeAndre Hopkins</a></b> (WR) 2013-2024</p>
+DIRECTORY_ENTRY = re.compile(
+    r'<a href="/players/[A-Z]/(?P<id>[^"./]+)\.htm">(?P<name>[^<]+)</a>(?:</b>)?\s*'
+    r'\((?P<pos>[^)]*)\)\s*(?P<first>\d{4})-(?P<last>\d{4})')
+
+
+def normalize(name):
+    """'Beckham Jr., Odell' / 'Odell Beckham Jr.' -> 'odell beckham'."""
+    if not isinstance(name, str):
+        return ''
+    if ',' in name:
+        last, first = name.split(',', 1)
+        name = f"{first} {last}"
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    name = name.lower().replace('-', ' ')
+    name = name.translate(str.maketrans('', '', string.punctuation))
+    return ' '.join(w for w in name.split() if w not in SUFFIXES)
+
+
+def parse_directory(html):
+    """Directory page -> [{Player_ID, Player, Pos, First_Year, Last_Year}, ...]."""
+    return [{'Player_ID': m['id'], 'Player': m['name'].strip(), 'Pos': m['pos'],
+             'First_Year': int(m['first']), 'Last_Year': int(m['last'])}
+            for m in DIRECTORY_ENTRY.finditer(html)]
+
+
+def build(letters=string.ascii_uppercase, use_drafts=True):
+    """Fetch the directory pages (through the rate limiter) and merge in stored draft picks."""
+    urls = [directory_url(letter) for letter in letters]
+    fetch_many(urls)
+
+    rows = []
+    for url in urls:
+        html = get_cached(url)
+        if html is None:
+            print(f"⚠️ Directory page not fetched: {url}")
+            continue
+        rows.extend(parse_directory(html))
+    index = pd.DataFrame(rows, columns=['Player_ID', 'Player', 'Pos', 'First_Year', 'Last_Year'])
+
+    if use_drafts and dataset_store.exists('drafts'):
+        drafts = dataset_store.load(['Player_ID', 'Player', 'Pos', 'Year', 'College'], table='drafts')
+        drafts = drafts[drafts['Player_ID'].notna()].rename(columns={'Year': 'Draft_Year'})
+        drafts = drafts.drop_duplicates('Player_ID').set_index('Player_ID')
+        index = index.set_index('Player_ID')
+        index = index.combine_first(drafts[['Player', 'Pos']]).join(drafts[['Draft_Year', 'College']])
+        index = index.reset_index()
+
+    index['Name_Key'] = index['Player'].map(normalize)
+    dataset_store.save(index, TABLE)
+    return index
+
+
+class PlayerIndex:
+    """Name -> Player_ID lookups over the stored index."""
+
+    def __init__(self, frame=None):
+        self.frame = dataset_store.load(table=TABLE) if frame is None else frame
+        self._by_key = {key: group for key, group in self.frame.groupby('Name_Key', sort=False)}
+        self._keys = list(self._by_key)
+
+    def candidates(self, name):
+        key = normalize(name)
+        if key in self._by_key:
+            return self._by_key[key]
+        close = difflib.get_close_matches(key, self._keys, n=3, cutoff=FUZZY_CUTOFF)
+        if not close:
+            return self.frame.iloc[0:0]
+        return pd.concat([self._by_key[k] for k in close])
+
+    def resolve(self, name, year=None, college=None, pos=None):
+        """
+        The Player_ID for a name, or None if it's unknown or still ambiguous.
+
+        Ties are broken by draft year (or rookie season, for the directory-only
+        entries), then college, then position.
+        """
+        found = self.candidates(name)
+        for column, wanted in (('year', year), ('College', college), ('Pos', pos)):
+            if len(found) <= 1:
+                break
+            if wanted is not None and not pd.isna(wanted):
+                found = self._narrow(found, column, wanted)
+        return found['Player_ID'].iloc[0] if len(found) == 1 else None
+
+    @staticmethod
+    def _narrow(found, column, wanted):
+        if column == 'year':
+            year = int(wanted)
+            drafted = found.get('Draft_Year')
+            match = (drafted == year) if drafted is not None else False
+            match = match | found['First_Year'].between(year, year + 1)
+        elif column in found.columns:
+            match = found[column].astype('string').str.lower() == str(wanted).lower()
+        else:
+            return found
+        match = match.fillna(False).astype(bool)
+        # A filter that rules everyone out is no help; keep the candidates we had
+        return found[match] if match.any() else found
+
+
+if __name__ == "__main__":
+    index = build()
+    print(f"✅ Indexed {len(index)} players into {dataset_store.path(TABLE)}")
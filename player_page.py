@@ -0,0 +1,204 @@
+import re
+import time
+
+import numpy as np
+
+import metrics
+from html_fragments import find_comment, find_table
+from html_parser import get_backend
+from page_cache import cached_get, player_url
+
+# === Extractor registry ===
+# Each extractor takes the parsed PlayerPage plus the record built so far and
+# returns a dict of new columns. They run in registration order, but each one
+# has to stand alone (--only per_game is valid), so none may rely on columns
+# another put in the record; shared work goes through the page's cached parse.
+
+EXTRACTORS = {}
+
+
+def extractor(name):
+    def register(fn):
+        EXTRACTORS[name] = fn
+        return fn
+    return register
+
+
+# PFR renamed a few data-stat keys in its site redesign; map both spellings onto one
+STAT_ALIASES = {'games': 'g', 'games_started': 'gs', 'team_name_abbr': 'team'}
+
+# The only cells the extractors ever read. Everything else in a row is skipped
+# without even pulling its text out of the parser.
+NUMERIC_STATS = ('g', 'gs', 'rec', 'rec_yds', 'rec_td', 'av')
+TEXT_STATS = ('team', 'awards')
+SEASON_STATS = frozenset(('year_id',) + NUMERIC_STATS + TEXT_STATS +
+                         tuple(k for k, v in STAT_ALIASES.items() if v in NUMERIC_STATS + TEXT_STATS))
+
+
+def _number(text):
+    try:
+        return float(text.replace(',', ''))
+    except ValueError:
+        return np.nan
+
+
+class PlayerPage:
+    """One fetched player page, parsed once and shared by every extractor."""
+
+    def __init__(self, player_id, html, parser=None):
+        self.player_id = player_id
+        self.html = html
+        self.backend = get_backend(parser)
+        self._rows = {}
+        self._seasons = {}
+
+    def comment(self, marker):
+        """Text of the first HTML comment containing `marker`, or None."""
+        return find_comment(self.html, marker)
+
+    def element_text(self, el_id):
+        return self.backend.element_text(self.html, el_id)
+
+    def table_rows(self, table_id, stats=None):
+        """Body rows of a stats table as {data-stat: text}, whether or not it's commented out."""
+        key = (table_id, stats)
+        if key not in self._rows:
+            rows = None
+            fragment = find_table(self.html, table_id)
+            if fragment:
+                with metrics.timer('wr_parse_seconds', table=table_id):
+                    rows = [{STAT_ALIASES.get(k, k): v for k, v in row.items()}
+                            for row in self.backend.table_rows(fragment, stats)]
+            self._rows[key] = rows
+        return self._rows[key]
+
+    def seasons(self, table_id='receiving_and_rushing'):
+        """
+        One entry per real NFL season as typed columns, or None if the table is missing.
+
+        'season' is an int array, NUMERIC_STATS are float arrays with NaN for
+        blank cells and TEXT_STATS are plain lists. Career/subtotal rows are
+        dropped and a traded player's first row for a season (PFR's combined
+        "2TM" line) wins, same as the old drop_duplicates(keep='first').
+        """
+        if table_id not in self._seasons:
+            cols = None
+            rows = self.table_rows(table_id, SEASON_STATS)
+            if rows:
+                picked, seen = [], set()
+                for row in rows:
+                    # Pro Bowl / All-Pro seasons show up as "2015*" or "2017*+"
+                    year = row.get('year_id', '')[:4]
+                    if year.isdigit() and year not in seen:
+                        seen.add(year)
+                        picked.append(row)
+
+                cols = {'season': np.array([int(r['year_id'][:4]) for r in picked], dtype=np.int32)}
+                for stat in NUMERIC_STATS:
+                    cols[stat] = np.array([_number(r.get(stat, '')) for r in picked], dtype=np.float64)
+                for stat in TEXT_STATS:
+                    cols[stat] = [r.get(stat, '') for r in picked]
+            self._seasons[table_id] = cols
+        return self._seasons[table_id]
+
+
+def _safe_sum(values):
+    if values is None or np.isnan(values).all():
+        return None
+    return int(np.nansum(values))
+
+
+# === Extractors ===
+
+@extractor('career_totals')
+def career_totals(page, record):
+    cols = page.seasons()
+    if cols is None:
+        return {'Career_AV': None, 'Games_Played': None, 'Receptions': None,
+                'Receiving_Yards': None, 'Receiving_TDs': None}
+    return {
+        'Career_AV': _safe_sum(cols['av']),
+        'Games_Played': _safe_sum(cols['g']),
+        'Receptions': _safe_sum(cols['rec']),
+        'Receiving_Yards': _safe_sum(cols['rec_yds']),
+        'Receiving_TDs': _safe_sum(cols['rec_td']),
+    }
+
+
+@extractor('honors')
+def honors(page, record):
+    recognition_text = (page.comment("Recognition") or "").lower()
+
+    if not recognition_text:
+        recognition_text = (page.element_text('meta') or "").lower()
+
+    stats = {'Pro_Bowls': 0, 'All_Pros': 0, 'OPOY': False}
+    if recognition_text:
+        pb_match = re.search(r'(\d+)[x\- ]+pro bowl', recognition_text)
+        ap_match = re.search(r'(\d+)[x\- ]+all-pro', recognition_text)
+        if pb_match:
+            stats['Pro_Bowls'] = int(pb_match.group(1))
+        if ap_match:
+            stats['All_Pros'] = int(ap_match.group(1))
+        if "opoy" in recognition_text or "offensive player of the year" in recognition_text:
+            stats['OPOY'] = True
+    return stats
+
+
+@extractor('season_yards')
+def season_yards(page, record):
+    cols = page.seasons()
+    if cols is None:
+        return {'Seasons_1000yd': 0}
+    return {'Seasons_1000yd': int((cols['rec_yds'] >= 1000).sum())}
+
+
+@extractor('per_game')
+def per_game(page, record):
+    # Totals straight off the page's (cached) seasons, so it's right when run alone too
+    totals = career_totals(page, record)
+    stats = {'Rec/Game': None, 'Yards/Game': None, 'TD/Game': None}
+    gp = totals['Games_Played']
+    if gp and gp > 0:
+        stats['Rec/Game'] = round(totals['Receptions'] / gp, 2) if totals['Receptions'] else 0
+        stats['Yards/Game'] = round(totals['Receiving_Yards'] / gp, 2) if totals['Receiving_Yards'] else 0
+        stats['TD/Game'] = round(totals['Receiving_TDs'] / gp, 2) if totals['Receiving_TDs'] else 0
+    return stats
+
+
+# === Pipeline ===
+
+def extract(page, extractors=None):
+    """Run the registered extractors (or just the named ones) over a parsed page."""
+    record = {'Player_ID': page.player_id}
+    for name, fn in EXTRACTORS.items():
+        if extractors is not None and name not in extractors:
+            continue
+        start = time.perf_counter()
+        try:
+            record.update(fn(page, record))
+        except Exception as e:
+            record['Note'] = f'{name} failed: {e}'
+        metrics.observe('wr_extract_seconds', time.perf_counter() - start, extractor=name)
+    record.setdefault('Note', 'Parsed')
+    return record
+
+
+def scrape_player(player_id, extractors=None):
+    """
+    Fetch a player page once and merge every extractor's output into one record.
+
+    Returns {'rate_limited': True} on a 429 so the batch loops can bail out
+    the same way they always have.
+    """
+    try:
+        response = cached_get(player_url(player_id), timeout=10)
+    except Exception as e:
+        return {'Player_ID': player_id, 'Note': f'Request error: {e}'}
+
+    if response.status_code == 429:
+        return {'rate_limited': True}
+    if not response.ok:
+        return {'Player_ID': player_id, 'Note': 'Request failed'}
+
+    return extract(PlayerPage(player_id, response.text), extractors)
@@ -0,0 +1,362 @@
+import hashlib
+import json
+import operator
+
+import numpy as np
+import pandas as pd
+
+# === Success scoring ===
+# Every success definition in the repo, declared as data (thresholds and
+# weights) in MODELS and compiled to whole-column NumPy expressions. All
+# models run over one shared set of normalized input columns, built once per
+# call, and come back side by side in one wide frame:
+#   <model>_score       weighted score, for models that declare 'score'
+#   <model>_successful  pass/fail label, for models that declare 'label'
+# Missing numbers count as 0, as they always did in the per-row scripts.
+#
+# A model spec:
+#   'version':  bump whenever the spec changes (rescoring keys on it)
+#   'score':    list of terms, summed. A term is either
+#                 {'column': c, 'per': points per unit, 'max': scale c by 1/max first, 'cap': max points}
+#               or {'when': criterion, 'points': p}
+#   'label':    a criterion. Either a (column, op, threshold) tuple or
+#               {'at_least': n, 'of': [criteria...]}
+#   'requires': column that must be > 0 for the label to mean anything (NA otherwise)
+
+GAMES_PER_SEASON = 16
+
+OPS = {'>=': operator.ge, '>': operator.gt, '<=': operator.le, '<': operator.lt, '==': operator.eq}
+
+
+def _numbers(df, col):
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+
+def parse_awards(awards):
+    """Awards strings ("PB,AP-1,OPoY") -> (pro_bowls, all_pros, opoy) arrays. Blank means none."""
+    awards = awards.astype('string').fillna('')
+    pro_bowls = awards.str.count('PB').to_numpy(dtype=np.float64)
+    all_pros = (awards.str.count('AP-1') + awards.str.count('AP-2')).to_numpy(dtype=np.float64)
+    opoy = awards.str.contains('OPoY', regex=False).to_numpy(dtype=bool)
+    return pro_bowls, all_pros, opoy
+
+
+def honors(df):
+    """Pro Bowls, All-Pros and OPOY per row, from Awards where it's filled in, else the honors columns."""
+    pro_bowls = _numbers(df, 'Pro_Bowls')
+    all_pros = _numbers(df, 'All_Pros')
+    opoy = (df['OPOY'].fillna(False).astype(bool).to_numpy() if 'OPOY' in df.columns
+            else np.zeros(len(df), dtype=bool))
+    if 'Awards' in df.columns:
+        has_awards = df['Awards'].notna().to_numpy()
+        a_pb, a_ap, a_opoy = parse_awards(df['Awards'])
+        pro_bowls = np.where(has_awards, a_pb, pro_bowls)
+        all_pros = np.where(has_awards, a_ap, all_pros)
+        opoy = np.where(has_awards, a_opoy, opoy)
+    return pro_bowls, all_pros, opoy
+
+
+def estimated_seasons(games):
+    """round(games / 16), at least 1 for anyone who played. Same half-to-even rounding as round()."""
+    return np.where(games > 0, np.maximum(1, np.round(games / GAMES_PER_SEASON)), 0)
+
+
+class Columns(dict):
+    """Normalized float inputs for a frame, each computed the first time a model asks for it."""
+
+    def __init__(self, df):
+        super().__init__()
+        self.df = df
+
+    def __missing__(self, col):
+        if col in ('Pro_Bowls', 'All_Pros', 'OPOY'):
+            pro_bowls, all_pros, opoy = honors(self.df)
+            self.update(Pro_Bowls=pro_bowls, All_Pros=all_pros, OPOY=opoy.astype(np.float64))
+        elif col == 'Estimated_Seasons':
+            self[col] = estimated_seasons(self['Games_Played'])
+        else:
+            self[col] = _numbers(self.df, col)
+        return self[col]
+
+
+# === Compiler ===
+
+def _criterion(spec):
+    if isinstance(spec, dict):
+        parts = [_criterion(s) for s in spec['of']]
+        need = spec.get('at_least', 1)
+        return lambda cols: sum(p(cols).astype(np.int8) for p in parts) >= need
+    col, op, threshold = spec
+    compare = OPS[op]
+    return lambda cols: compare(cols[col], threshold)
+
+
+def _term(spec):
+    if 'when' in spec:
+        test, points = _criterion(spec['when']), spec['points']
+        return lambda cols: test(cols) * points
+
+    col, per, scale, cap = spec['column'], spec.get('per', 1), spec.get('max'), spec.get('cap')
+
+    def term(cols):
+        value = cols[col] if scale is None else cols[col] / scale
+        points = value * per
+        return points if cap is None else np.minimum(points, cap)
+    return term
+
+
+def compile_model(name, spec):
+    """Turn a declarative spec into fn(Columns) -> {output column: array}."""
+    terms = [_term(t) for t in spec.get('score', [])]
+    label = _criterion(spec['label']) if 'label' in spec else None
+    requires = spec.get('requires')
+
+    def model(cols):
+        out = {}
+        if terms:
+            out[f'{name}_score'] = sum(t(cols) for t in terms)
+        if label is not None:
+            passed = pd.array(label(cols), dtype='boolean')
+            if requires:
+                passed[~(cols[requires] > 0)] = pd.NA
+            out[f'{name}_successful'] = passed
+        return out
+    return model
+
+
+# === Registry ===
+
+MODELS = {}
+_compiled = {}
+
+
+def register(name, spec):
+    MODELS[name] = spec
+    _compiled[name] = compile_model(name, spec)
+
+
+def register_file(path):
+    """Register every model in a JSON file of {name: spec} (criteria as [column, op, threshold] lists)."""
+    with open(path) as f:
+        for name, spec in json.load(f).items():
+            register(name, spec)
+
+
+def _spec_columns(spec):
+    if isinstance(spec, dict):
+        for key in ('of', 'score'):
+            for part in spec.get(key, []):
+                yield from _spec_columns(part)
+        for key in ('label', 'when'):
+            if key in spec:
+                yield from _spec_columns(spec[key])
+        if 'column' in spec:
+            yield spec['column']
+        if 'requires' in spec:
+            yield spec['requires']
+    else:
+        yield spec[0]
+
+
+# Stored columns a normalized input is built from
+_DERIVED_FROM = {
+    'Estimated_Seasons': ('Games_Played',),
+    'Pro_Bowls': ('Pro_Bowls', 'Awards'),
+    'All_Pros': ('All_Pros', 'Awards'),
+    'OPOY': ('OPOY', 'Awards'),
+}
+
+
+def inputs(models=None):
+    """Stored columns the named models (default: all) read, in a stable order."""
+    needed = []
+    for name in models or MODELS:
+        for col in _spec_columns(MODELS[name]):
+            for source in _DERIVED_FROM.get(col, (col,)):
+                if source not in needed:
+                    needed.append(source)
+    return needed
+
+
+def evaluate(df, models=None):
+    """Run the registered models (or just the named ones) over `df` into one wide frame, same index."""
+    cols = Columns(df)
+    out = {}
+    for name in models or MODELS:
+        out.update(_compiled[name](cols))
+    return pd.DataFrame(out, index=df.index)
+
+
+# README "Success Criteria (Binary Pass/Fail)". The table doesn't say how many
+# rows to pass; 2, like the other criteria lists. "Top-30 fantasy rank" isn't
+# scraped, so only the points-based fantasy row is here.
+register('readme_binary', {
+    'version': 1,
+    'label': {'at_least': 2, 'of': [
+        ('Career_AV', '>=', 40),
+        ('Games_Played', '>=', 80),
+        ('Pro_Bowls', '>=', 2),
+        ('All_Pros', '>=', 1),
+        ('OPOY', '>=', 1),
+        ('Fantasy_Seasons', '>=', 2),
+    ]},
+})
+
+# README "Weighted Success Score" (same caveat about fantasy rank)
+register('readme_weighted', {
+    'version': 1,
+    'score': [
+        {'column': 'Career_AV', 'per': 1, 'cap': 40},
+        {'column': 'Games_Played', 'per': 0.5, 'cap': 40},
+        {'column': 'Pro_Bowls', 'per': 5, 'cap': 10},
+        {'column': 'All_Pros', 'per': 10, 'cap': 10},
+        {'column': 'OPOY', 'per': 10, 'cap': 10},
+        {'column': 'Fantasy_Seasons', 'per': 2, 'cap': 4},
+    ],
+})
+
+# calculate_success_scores_safe.py
+register('safe', {
+    'version': 1,
+    'score': [
+        {'column': 'Career_AV', 'per': 1.5},
+        {'column': 'Games_Played', 'per': 0.4},
+        {'column': 'Estimated_Seasons', 'per': 5},
+        {'column': 'All_Pros', 'per': 15},
+        {'column': 'Pro_Bowls', 'per': 8},
+        {'column': 'OPOY', 'per': 15},
+        {'when': ('Seasons_1000yd', '>=', 2), 'points': 10},
+    ],
+    'label': {'at_least': 2, 'of': [
+        ('Career_AV', '>=', 40),
+        ('Games_Played', '>=', 65),
+        ('Estimated_Seasons', '>=', 5),
+        ('Pro_Bowls', '>=', 2),
+        ('All_Pros', '>=', 1),
+        ('Seasons_1000yd', '>=', 2),
+    ]},
+})
+
+# scrape_wr_full.py: 2 of 3 per-game marks, or AV >= 40, or 2+ Pro Bowls
+register('per_game', {
+    'version': 1,
+    'requires': 'Games_Played',
+    'label': {'at_least': 1, 'of': [
+        {'at_least': 2, 'of': [
+            ('Rec/Game', '>=', 4.5),
+            ('Yards/Game', '>=', 55),
+            ('TD/Game', '>=', 0.3),
+        ]},
+        ('Career_AV', '>=', 40),
+        ('Pro_Bowls', '>=', 2),
+    ]},
+})
+
+# DHop_test.py: 2 of 3 stricter per-game marks
+register('dhop', {
+    'version': 1,
+    'label': {'at_least': 2, 'of': [
+        ('Rec/Game', '>=', 5.0),
+        ('Yards/Game', '>=', 65),
+        ('TD/Game', '>=', 0.4),
+    ]},
+})
+
+# performance_scorer.py: each input scaled by a realistic max, weighted, out of 100
+register('performance', {
+    'version': 1,
+    'score': [
+        {'column': 'Rec/Game', 'max': 10, 'per': 20},
+        {'column': 'Yards/Game', 'max': 100, 'per': 30},
+        {'column': 'TD/Game', 'max': 1, 'per': 20},
+        {'column': 'Career_AV', 'max': 120, 'per': 15},
+        {'column': 'Pro_Bowls', 'max': 5, 'per': 10},
+        {'column': 'All_Pros', 'max': 3, 'per': 5},
+    ],
+})
+
+
+def success_scores(df):
+    """Estimated_Seasons, Success_Score and Successful (the 'safe' model) for every row of `df`."""
+    cols = Columns(df)
+    out = _compiled['safe'](cols)
+    return pd.DataFrame({
+        'Estimated_Seasons': cols['Estimated_Seasons'].astype(np.int64),
+        'Success_Score': out['safe_score'],
+        'Successful': out['safe_successful'],
+    }, index=df.index)
+
+
+# === Incremental rescoring ===
+# Each scored row keeps a <model>_hash of its inputs and the model spec. A
+# rescore recomputes the hashes (cheap, vectorized), then only evaluates rows
+# whose hash moved: new players, changed stats, or every row of a model whose
+# spec changed (including a version bump).
+
+def fingerprint(name):
+    """Short hash of a model's spec, so editing it (or bumping 'version') invalidates its scores."""
+    spec = json.dumps(MODELS[name], sort_keys=True, default=list)
+    return hashlib.sha1(spec.encode()).hexdigest()[:16]
+
+
+def row_hashes(df, name):
+    """Per-row hex hash of the stored inputs `name` reads, salted with its fingerprint."""
+    present = [c for c in inputs([name]) if c in df.columns]
+    salt = hashlib.sha1(f"{fingerprint(name)}:{','.join(present)}".encode()).digest()[:8]
+    hashed = (pd.util.hash_pandas_object(df[present], index=False).to_numpy()
+              if present else np.zeros(len(df), dtype=np.uint64))
+    hashed = hashed ^ np.frombuffer(salt, dtype=np.uint64)[0]
+    return pd.Series(hashed, index=df.index).map('{:016x}'.format)
+
+
+def rescore(models=None, df=None, table='scores', outputs=None, player_ids=None):
+    """
+    Score only the rows whose inputs or model changed and upsert them into `table`.
+
+    `df` defaults to the models' inputs from the players table, narrowed to
+    `player_ids` when given (e.g. a delta refresh's change list). `outputs`
+    maps (rows, model name) to the columns to store; the default is
+    evaluate()'s <model>_score / <model>_successful. Returns {model: rows rescored}.
+    """
+    import dataset_store
+    import metrics
+
+    models = list(models or MODELS)
+    if df is None:
+        df = dataset_store.load(['Player_ID'] + inputs(models))
+    if player_ids is not None:
+        df = df[df['Player_ID'].isin(list(player_ids))]
+    outputs = outputs or (lambda rows, name: evaluate(rows, [name]))
+
+    hash_cols = [f'{name}_hash' for name in models]
+    if dataset_store.exists(table):
+        stored = dataset_store.load(['Player_ID'] + hash_cols, table=table)
+        stored = stored.drop_duplicates('Player_ID', keep='last').set_index('Player_ID')
+    else:
+        stored = pd.DataFrame(index=pd.Index([], name='Player_ID'))
+
+    rescored = {}
+    for name in models:
+        current = row_hashes(df, name)
+        previous = (df['Player_ID'].map(stored[f'{name}_hash']) if f'{name}_hash' in stored.columns
+                    else pd.Series('', index=df.index))
+        stale = (current != previous.astype(object).fillna('')).to_numpy()
+        rescored[name] = int(stale.sum())
+        if not stale.any():
+            continue
+        rows = df[stale]
+        with metrics.stage('score'):
+            patch = rows[['Player_ID']].join(outputs(rows, name))
+        patch[f'{name}_hash'] = current[stale]
+        dataset_store.upsert(patch, table=table)
+    return rescored
+
+
+if __name__ == "__main__":
+    import dataset_store
+
+    for name, count in rescore().items():
+        print(f"🧮 {name}: rescored {count} players")
+    print(f"✅ Scores up to date in {dataset_store.path('scores')}")
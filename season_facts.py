@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+import dataset_store
+from player_page import NUMERIC_STATS, TEXT_STATS
+
+# === Player-season fact table ===
+# One row per player per NFL season, straight from the receiving_and_rushing
+# table the extractors already parse. Career totals, per-game rates, 1000-yard
+# seasons and fantasy seasons are group-bys over this table, so a new metric
+# is a new aggregation here instead of a re-scrape.
+
+TABLE = 'seasons'
+KEY = ['Player_ID', 'season']
+COLUMNS = KEY + ['team'] + list(NUMERIC_STATS) + [s for s in TEXT_STATS if s != 'team']
+
+# PPR points from receiving alone: 1 per catch, 1 per 10 yards, 6 per TD.
+# 180+ is the README's bar for a fantasy-relevant season.
+FANTASY_SEASON_POINTS = 180
+
+
+def season_rows(page):
+    """The page's seasons as fact rows ([] if the table is missing). Reuses the page's parse."""
+    cols = page.seasons()
+    if cols is None:
+        return []
+    rows = []
+    for i, season in enumerate(cols['season']):
+        row = {'Player_ID': page.player_id, 'season': int(season)}
+        for stat in TEXT_STATS:
+            row[stat] = cols[stat][i] or None
+        for stat in NUMERIC_STATS:
+            value = cols[stat][i]
+            row[stat] = None if np.isnan(value) else value
+        rows.append(row)
+    return rows
+
+
+def save_seasons(rows):
+    """Store fact rows, replacing everything held for those players."""
+    if not rows:
+        return 0
+    facts = pd.DataFrame(rows, columns=COLUMNS)
+    dataset_store.replace(facts, TABLE, key='Player_ID')
+    return len(facts)
+
+
+def load_seasons(columns=None):
+    return dataset_store.load(columns, table=TABLE)
+
+
+def _same(a, b):
+    if pd.isna(a) or pd.isna(b):
+        return pd.isna(a) and pd.isna(b)
+    return a == b
+
+
+def season_delta(rows, season):
+    """
+    The `season` rows that differ from the stored facts, as [(row, [changed columns])].
+
+    A player-season we've never stored lists every column. Rows for other
+    seasons are ignored: in season only the latest line on a page moves.
+    """
+    fresh = dataset_store.coerce(pd.DataFrame([r for r in rows if r['season'] == season], columns=COLUMNS))
+    if fresh.empty:
+        return []
+    stored = {}
+    if dataset_store.exists(TABLE):
+        facts = load_seasons()
+        facts = facts[(facts['season'] == season) & facts['Player_ID'].isin(fresh['Player_ID'])]
+        stored = dict(zip(facts['Player_ID'], facts.to_dict('records')))
+
+    delta = []
+    for row in fresh.to_dict('records'):
+        old = stored.get(row['Player_ID'])
+        changed = [c for c in COLUMNS if c not in KEY and (old is None or not _same(row[c], old.get(c)))]
+        if changed:
+            delta.append((row, changed))
+    return delta
+
+
+def uncovered(rows):
+    """
+    Player IDs whose stored facts are missing a season their parsed page has.
+
+    A delta only makes sense on top of a complete career; these players need
+    every parsed row saved before their career columns are rebuilt.
+    """
+    parsed = {}
+    for row in rows:
+        parsed.setdefault(row['Player_ID'], set()).add(row['season'])
+    stored = {}
+    if dataset_store.exists(TABLE):
+        facts = load_seasons(['Player_ID', 'season'])
+        facts = facts[facts['Player_ID'].isin(list(parsed))]
+        for player_id, group in facts.groupby('Player_ID')['season']:
+            stored[player_id] = set(group.dropna().astype(int))
+    latest = {pid: max(seasons) for pid, seasons in parsed.items()}
+    # The latest season is the delta's job; anything older must already be stored
+    return [pid for pid, seasons in parsed.items()
+            if seasons - {latest[pid]} - stored.get(pid, set()) or pid not in stored]
+
+
+def save_delta(delta):
+    """Upsert just the changed player-seasons. Returns their Player_IDs."""
+    if not delta:
+        return []
+    changed = pd.DataFrame([row for row, _ in delta], columns=COLUMNS)
+    dataset_store.upsert(changed, table=TABLE, key=KEY)
+    return changed['Player_ID'].tolist()
+
+
+def fantasy_points(facts):
+    return facts['rec'].fillna(0) + facts['rec_yds'].fillna(0) / 10 + facts['rec_td'].fillna(0) * 6
+
+
+# Totals a refresh can only ever raise. Seasons_Played isn't one: rows stored
+# before enrich_wr_data counted seasons with games (as career_metrics does) hold
+# a count of table rows, which may be higher, and must not block a rebuild.
+CAREER_TOTALS = ['Career_AV', 'Games_Played', 'Receptions', 'Receiving_Yards', 'Receiving_TDs']
+
+
+def shrunk(new, current):
+    """Player IDs whose rebuilt career totals would come out lower than what's stored."""
+    current = current.drop_duplicates('Player_ID').set_index('Player_ID')
+    new = new.set_index('Player_ID')
+    cols = [c for c in CAREER_TOTALS if c in current.columns and c in new.columns]
+    if not cols:
+        return []
+    before = current.reindex(new.index)[cols].astype('Float64')
+    lower = (new[cols].astype('Float64') < before).fillna(False).any(axis=1)
+    return lower[lower].index.tolist()
+
+
+def career_metrics(facts):
+    """Per-player career columns (the same ones the extractors produce), one row per Player_ID."""
+    facts = facts.assign(
+        _1000yd=facts['rec_yds'] >= 1000,
+        _fantasy=fantasy_points(facts) >= FANTASY_SEASON_POINTS,
+        _played=facts['g'] > 0,
+    )
+    grouped = facts.groupby('Player_ID', sort=False)
+    out = pd.DataFrame({
+        'Career_AV': grouped['av'].sum(min_count=1),
+        'Games_Played': grouped['g'].sum(min_count=1),
+        'Receptions': grouped['rec'].sum(min_count=1),
+        'Receiving_Yards': grouped['rec_yds'].sum(min_count=1),
+        'Receiving_TDs': grouped['rec_td'].sum(min_count=1),
+        'Seasons_Played': grouped['_played'].sum(),
+        'Seasons_1000yd': grouped['_1000yd'].sum(),
+        'Fantasy_Seasons': grouped['_fantasy'].sum(),
+    })
+
+    games = out['Games_Played'].where(out['Games_Played'] > 0)
+    out['Rec/Game'] = (out['Receptions'].fillna(0) / games).round(2)
+    out['Yards/Game'] = (out['Receiving_Yards'].fillna(0) / games).round(2)
+    out['TD/Game'] = (out['Receiving_TDs'].fillna(0) / games).round(2)
+    return out.reset_index()
+
+
+if __name__ == "__main__":
+    facts = load_seasons()
+    metrics = career_metrics(facts)
+    known = dataset_store.load(['Player_ID'])['Player_ID']
+    metrics = metrics[metrics['Player_ID'].isin(known)]
+    dataset_store.upsert(metrics)
+    print(f"✅ Rebuilt career metrics for {len(metrics)} players from {len(facts)} seasons")
@@ -0,0 +1,242 @@
+import argparse
+import gzip
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from html_fragments import page_from_dump
+
+# === Local PFR stand-in ===
+# Serves recorded pages on localhost so the fetch side of the pipeline can be
+# benchmarked and exercised without touching the real site. Pages come from a
+# directory laid out like the site (players/H/HopkDe00.htm, years/2013/draft.htm,
+# optionally .gz) plus the Hopkins dump, which answers for any player page we
+# don't have a recording of.
+#
+# Faults, all seeded so a run can be replayed exactly:
+#   latency       per-response delay, e.g. "fixed:0.05", "uniform:0.02,0.3",
+#                 "lognormal:-2.5,0.8" (mu, sigma of ln seconds), "exp:0.1" (mean)
+#   burst_every   every Nth request starts a run of `burst_length` 429s carrying
+#                 Retry-After: `retry_after`
+#   truncate      fraction of 200s whose body is cut off mid-stream
+#   drift         fraction of 200s whose HTML is rewritten by one of DRIFTS
+
+DEFAULT_FIXTURE = "hopkins_html_comments_dump.txt"
+
+
+def parse_latency(spec):
+    """Latency spec -> fn(rng) -> seconds. None/"" means no delay."""
+    if not spec:
+        return lambda rng: 0
+    kind, _, args = spec.partition(':')
+    params = [float(x) for x in args.split(',') if x]
+    if kind == 'fixed':
+        return lambda rng: params[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(params[0], params[1])
+    if kind == 'exp':
+        return lambda rng: rng.expovariate(1 / params[0])
+    raise ValueError(f"Unknown latency distribution {kind!r} (fixed, uniform, lognormal, exp)")
+
+
+# === Structure drift ===
+# Ways PFR has changed (or could change) its markup under us.
+
+def _renamed_stats(html):
+    # The site redesign's data-stat names (player_page.STAT_ALIASES maps them back)
+    for old, new in (('g', 'games'), ('gs', 'games_started'), ('team', 'team_name_abbr')):
+        html = html.replace(f'data-stat="{old}"', f'data-stat="{new}"')
+    return html
+
+
+def _uncommented(html):
+    # Tables shipped as live HTML instead of inside <!-- -->
+    return html.replace('<!--', '').replace('-->', '')
+
+
+def _missing_table(html):
+    # A table dropped from the page entirely
+    return re.sub(r'<table[^>]*id="receiving_and_rushing".*?</table>', '', html, flags=re.S)
+
+
+DRIFTS = {
+    'renamed_stats': _renamed_stats,
+    'uncommented': _uncommented,
+    'missing_table': _missing_table,
+}
+
+
+def load_pages(directory):
+    """{url path: html} for every recorded page under `directory`."""
+    pages = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            full = os.path.join(root, name)
+            path = '/' + os.path.relpath(full, directory).replace(os.sep, '/')
+            with open(full, 'rb') as f:
+                data = f.read()
+            if name.endswith('.gz'):
+                data, path = gzip.decompress(data), path[:-3]
+            pages[path] = data.decode('utf-8', errors='replace')
+    return pages
+
+
+def default_player_page(fixture=DEFAULT_FIXTURE):
+    with open(fixture) as f:
+        return page_from_dump(f.read())
+
+
+class StubServer:
+    """A threaded HTTP server over recorded pages. Use as a context manager; .url is the base URL."""
+
+    def __init__(self, pages=None, player_page=None, port=0, latency=None, burst_every=0,
+                 burst_length=0, retry_after=30, truncate=0.0, drift=0.0, drifts=tuple(DRIFTS), seed=0):
+        self.pages = pages or {}
+        self.player_page = player_page
+        self.latency = parse_latency(latency)
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after = retry_after
+        self.truncate = truncate
+        self.drift = drift
+        self.drifts = [DRIFTS[name] for name in drifts]
+        self.stats = {'requests': 0, 'ok': 0, '404': 0, '429': 0, 'truncated': 0, 'drifted': 0}
+        self._rng = random.Random(seed)
+        self._burst_left = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, path):
+        """Body for a path, or None for a 404."""
+        if path in self.pages:
+            return self.pages[path]
+        if path.startswith('/players/') and path.endswith('.htm'):
+            return self.player_page
+        return None
+
+    @property
+    def requests(self):
+        return self.stats['requests']
+
+    def _plan(self):
+        """Decide this response's faults under the lock, so seeded runs replay exactly."""
+        with self._lock:
+            self.stats['requests'] += 1
+            n = self.stats['requests']
+            if self.burst_every and n % self.burst_every == 0:
+                self._burst_left = self.burst_length
+            throttled = self._burst_left > 0
+            if throttled:
+                self._burst_left -= 1
+            delay = self.latency(self._rng)
+            truncate = self._rng.random() < self.truncate
+            drift = self._rng.choice(self.drifts) if self.drifts and self._rng.random() < self.drift else None
+            cut = self._rng.random()
+        return throttled, delay, truncate, drift, cut
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def respond(self, handler):
+        throttled, delay, truncate, drift, cut = self._plan()
+        if delay:
+            time.sleep(delay)
+
+        if throttled:
+            self._count('429')
+            handler.send_response(429)
+            handler.send_header('Retry-After', str(self.retry_after))
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+
+        body = self.page(handler.path.split('?', 1)[0])
+        if body is None:
+            self._count('404')
+            handler.send_error(404)
+            return
+        if drift:
+            self._count('drifted')
+            body = drift(body)
+
+        data = body.encode('utf-8')
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/html; charset=utf-8')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        if truncate:
+            # Promise the full length, send part of it and hang up
+            self._count('truncated')
+            handler.wfile.write(data[:int(len(data) * cut)])
+            handler.close_connection = True
+            return
+        self._count('ok')
+        handler.wfile.write(data)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.respond(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded PFR pages on localhost.")
+    parser.add_argument("pages", nargs="?", help="directory of recorded pages laid out like the site")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", help='e.g. "uniform:0.05,0.4" or "lognormal:-2.5,0.8"')
+    parser.add_argument("--burst-every", type=int, default=0, help="start a 429 burst every N requests")
+    parser.add_argument("--burst-length", type=int, default=5)
+    parser.add_argument("--retry-after", type=int, default=30)
+    parser.add_argument("--truncate", type=float, default=0.0, help="fraction of bodies cut short")
+    parser.add_argument("--drift", type=float, default=0.0, help="fraction of pages with drifted markup")
+    parser.add_argument("--drifts", nargs="*", default=list(DRIFTS), choices=list(DRIFTS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubServer(load_pages(args.pages) if args.pages else None, default_player_page(), args.port,
+                        latency=args.latency, burst_every=args.burst_every, burst_length=args.burst_length,
+                        retry_after=args.retry_after, truncate=args.truncate, drift=args.drift,
+                        drifts=args.drifts, seed=args.seed)
+    print(f"🏟️ Serving {len(server.pages)} recorded pages (+ Hopkins for any other player) on {server.url}")
+    print(f"   point the scrapers at it with WR_BASE_URL={server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"📊 {server.stats}")
@@ -0,0 +1,51 @@
+import unittest
+
+from html_fragments import page_from_dump
+from html_parser import available
+from player_page import PlayerPage, extract
+
+# Every installed parser backend has to pull exactly the same rows and record
+# out of the recorded pages. With fewer than two backends there's nothing to
+# compare, and that's a failure, not a skip: install selectolax and lxml
+# (beautifulsoup4 too) before trusting a green run.
+
+DUMP = "hopkins_html_comments_dump.txt"
+PLAYER_PAGES = ("fixtures/players/H/HopkDe00.htm", "fixtures/players/H/HopkDe00.commented.htm")
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class BackendEquivalence(unittest.TestCase):
+
+    def setUp(self):
+        self.names = available()
+        if len(self.names) < 2:
+            self.fail(f"need at least two parser backends to compare, found {self.names or 'none'}")
+
+    def assertBackendsAgree(self, html, table_id):
+        results = {}
+        for name in self.names:
+            page = PlayerPage('HopkDe00', html, parser=name)
+            results[name] = (page.table_rows(table_id), extract(page))
+        baseline = self.names[0]
+        self.assertTrue(results[baseline][0], f"{baseline} found no {table_id} rows")
+        for name in self.names[1:]:
+            self.assertEqual(results[name], results[baseline], f"{name} disagrees with {baseline}")
+        return results[baseline]
+
+    def test_dump_fantasy_table(self):
+        self.assertBackendsAgree(page_from_dump(_read(DUMP)), 'fantasy')
+
+    def test_receiving_table_live_and_commented(self):
+        live = self.assertBackendsAgree(_read(PLAYER_PAGES[0]), 'receiving_and_rushing')
+        commented = self.assertBackendsAgree(_read(PLAYER_PAGES[1]), 'receiving_and_rushing')
+        self.assertEqual(commented, live)
+        for col in ('Games_Played', 'Receiving_Yards', 'Receiving_TDs', 'Career_AV'):
+            self.assertIsNotNone(live[1][col], col)
+
+
+if __name__ == "__main__":
+    unittest.main()
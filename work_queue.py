@@ -0,0 +1,286 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import metrics
+import page_cache
+from fetcher import MAX_ATTEMPTS, MAX_BACKOFF, MAX_RATE, MIN_BACKOFF, parse_retry_after
+
+# === Shared work queue ===
+# A SQLite file of player IDs that any number of worker processes (or hosts
+# sharing the file) pull from. A worker leases a batch, heartbeats while it
+# works, and marks each player done (with its parsed record) or failed. Leases
+# that stop heartbeating expire and go back to the pool; players that fail
+# MAX_ATTEMPTS times are parked as 'failed'. One token bucket row in the same
+# file is the global request budget every worker draws from, 429 cooldowns
+# included. Results stay in the queue until merge_results() writes them to the
+# dataset store in one go, so workers never race each other on the Parquet file.
+# A result carries its page's fetch time along with the parse, so the merge can
+# record freshness without the page being in the merging host's cache.
+#
+# WAL mode is fastest but relies on shared memory, so it only works for
+# processes on one machine. To share the file between hosts over a network
+# filesystem, set WR_QUEUE_SHARED=1: the queue then uses SQLite's rollback
+# journal, which only needs the filesystem's locks to be honest (NFS with
+# working locking, SMB; not a sync folder like Dropbox).
+
+QUEUE_DB = os.environ.get("WR_QUEUE_DB", "work_queue.db")
+SHARED = os.environ.get("WR_QUEUE_SHARED", "") == "1"
+LEASE_SECONDS = 120
+BATCH = 10
+
+
+@contextmanager
+def _db(path=None):
+    conn = sqlite3.connect(path or QUEUE_DB, timeout=60, isolation_level=None)
+    conn.execute(f"PRAGMA journal_mode={'DELETE' if SHARED else 'WAL'}")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            player_id TEXT PRIMARY KEY,
+            state TEXT NOT NULL DEFAULT 'pending',   -- pending | leased | done | failed
+            attempts INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            lease_expires REAL,
+            error TEXT,
+            result TEXT,                             -- JSON: {'record': ..., 'seasons': [...], 'fetched_at': ...}
+            merged INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS budget (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            tokens REAL NOT NULL,
+            updated REAL NOT NULL,
+            rate REAL NOT NULL,
+            cooldown_until REAL NOT NULL DEFAULT 0,
+            strikes INTEGER NOT NULL DEFAULT 0
+        )""")
+    conn.execute("INSERT OR IGNORE INTO budget (id, tokens, updated, rate) VALUES (1, 1, ?, ?)",
+                 (time.time(), MAX_RATE))
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def _txn(conn):
+    # IMMEDIATE takes the write lock up front, so two workers can't lease the same rows
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(player_ids, force=False):
+    """Add players to the queue. force=True resets ones already done or failed."""
+    with _db() as conn, _txn(conn):
+        before = conn.total_changes
+        if force:
+            conn.executemany(
+                "INSERT INTO jobs (player_id, updated_at) VALUES (?, ?) ON CONFLICT(player_id) DO UPDATE "
+                "SET state='pending', attempts=0, error=NULL, owner=NULL, lease_expires=NULL",
+                [(pid, time.time()) for pid in player_ids])
+        else:
+            conn.executemany("INSERT OR IGNORE INTO jobs (player_id, updated_at) VALUES (?, ?)",
+                             [(pid, time.time()) for pid in player_ids])
+        return conn.total_changes - before
+
+
+def lease(worker, n=BATCH, seconds=LEASE_SECONDS):
+    """Claim up to n pending (or abandoned) players for `seconds`. Returns their IDs."""
+    now = time.time()
+    with _db() as conn, _txn(conn):
+        # Abandoned on their last attempt: nobody may lease them again, so park them
+        conn.execute("UPDATE jobs SET state='failed', error=COALESCE(error, 'lease expired'), owner=NULL, "
+                     "lease_expires=NULL, updated_at=? WHERE state='leased' AND lease_expires < ? "
+                     "AND attempts >= ?", (now, now, MAX_ATTEMPTS))
+        ids = [r[0] for r in conn.execute(
+            "SELECT player_id FROM jobs WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) "
+            "AND attempts < ? ORDER BY attempts, updated_at LIMIT ?", (now, MAX_ATTEMPTS, n))]
+        conn.executemany(
+            "UPDATE jobs SET state='leased', owner=?, lease_expires=?, attempts=attempts+1, updated_at=? "
+            "WHERE player_id=?", [(worker, now + seconds, now, pid) for pid in ids])
+    return ids
+
+
+def heartbeat(worker, seconds=LEASE_SECONDS):
+    """Extend every lease this worker holds. Returns how many it still has."""
+    with _db() as conn, _txn(conn):
+        return conn.execute("UPDATE jobs SET lease_expires=? WHERE owner=? AND state='leased'",
+                            (time.time() + seconds, worker)).rowcount
+
+
+def complete(worker, player_id, record, seasons=(), fetched_at=None):
+    result = {'record': record, 'seasons': list(seasons), 'fetched_at': fetched_at}
+    with _db() as conn, _txn(conn):
+        conn.execute("UPDATE jobs SET state='done', result=?, merged=0, error=NULL, owner=NULL, updated_at=? "
+                     "WHERE player_id=? AND owner=?",
+                     (json.dumps(result, default=str), time.time(), player_id, worker))
+
+
+def fail(worker, player_id, error, retry=True):
+    """Give a player back (or park it as failed once it's out of attempts)."""
+    with _db() as conn, _txn(conn):
+        conn.execute(
+            "UPDATE jobs SET state=CASE WHEN ? AND attempts < ? THEN 'pending' ELSE 'failed' END, "
+            "error=?, owner=NULL, lease_expires=NULL, updated_at=? WHERE player_id=? AND owner=?",
+            (retry, MAX_ATTEMPTS, str(error), time.time(), player_id, worker))
+
+
+def release(worker, player_id):
+    """Hand a lease back without using up an attempt (e.g. we got throttled before trying)."""
+    with _db() as conn, _txn(conn):
+        conn.execute("UPDATE jobs SET state='pending', attempts=attempts-1, owner=NULL, lease_expires=NULL "
+                     "WHERE player_id=? AND owner=?", (player_id, worker))
+
+
+# === Global rate budget ===
+
+def take_token():
+    """Take one request from the shared bucket. Returns 0 if granted, else seconds to wait."""
+    now = time.time()
+    with _db() as conn, _txn(conn):
+        tokens, updated, rate, cooldown_until = conn.execute(
+            "SELECT tokens, updated, rate, cooldown_until FROM budget WHERE id = 1").fetchone()
+        if cooldown_until > now:
+            return cooldown_until - now
+        tokens = min(1.0, tokens + (now - updated) * rate)
+        granted = tokens >= 1
+        conn.execute("UPDATE budget SET tokens=?, updated=? WHERE id = 1",
+                     (tokens - 1 if granted else tokens, now))
+        return 0 if granted else (1 - tokens) / rate
+
+
+def throttled(retry_after=None):
+    """A worker got a 429: every worker cools down and the shared rate halves."""
+    with _db() as conn, _txn(conn):
+        strikes, rate = conn.execute("SELECT strikes, rate FROM budget WHERE id = 1").fetchone()
+        strikes += 1
+        wait = min(MAX_BACKOFF, retry_after if retry_after is not None else MIN_BACKOFF * 2 ** (strikes - 1))
+        conn.execute("UPDATE budget SET strikes=?, rate=?, cooldown_until=MAX(cooldown_until, ?) WHERE id = 1",
+                     (strikes, max(MAX_RATE / 16, rate / 2), time.time() + wait))
+    return wait
+
+
+def recovered():
+    """A clean response: creep the shared rate back towards MAX_RATE."""
+    with _db() as conn, _txn(conn):
+        conn.execute("UPDATE budget SET strikes=0, rate=MIN(?, rate * 1.1) WHERE id = 1 "
+                     "AND (strikes > 0 OR rate < ?)", (MAX_RATE, MAX_RATE))
+
+
+def _wait_for_token(worker):
+    while True:
+        wait = take_token()
+        if not wait:
+            return
+        # Keep our leases alive through long cooldowns
+        time.sleep(min(wait, LEASE_SECONDS / 3))
+        heartbeat(worker)
+
+
+# === Worker ===
+
+def work_one(worker, player_id, extractors=None):
+    """Fetch (drawing on the shared budget) and parse one player, then record the outcome."""
+    from parse_stage import parse_one
+
+    url = page_cache.player_url(player_id)
+    if not page_cache.is_fresh(url):
+        _wait_for_token(worker)
+        try:
+            response = page_cache.cached_get(url, force=True)
+        except Exception as e:
+            metrics.inc('wr_fetch_retries_total', reason='error')
+            fail(worker, player_id, e)
+            return 'error'
+        if response.status_code == 429:
+            wait = throttled(parse_retry_after(response.headers.get("Retry-After")))
+            metrics.inc('wr_rate_limited_total')
+            metrics.event('rate_limited', url=url, wait=round(wait, 1), worker=worker)
+            release(worker, player_id)
+            return 'throttled'
+        if not response.ok:
+            fail(worker, player_id, f"HTTP {response.status_code}", retry=response.status_code >= 500)
+            return 'failed'
+        recovered()
+
+    record, seasons = parse_one(('cache', url), extractors)
+    entry = page_cache.lookup(url)
+    complete(worker, player_id, record, seasons, entry and entry['fetched_at'])
+    return 'done'
+
+
+def run_worker(worker=None, extractors=None, batch=BATCH):
+    """Pull batches until the queue is empty. Safe to run many of these at once, anywhere."""
+    worker = worker or worker_name()
+    counts = {}
+    while True:
+        ids = lease(worker, batch)
+        if not ids:
+            break
+        for player_id in ids:
+            outcome = work_one(worker, player_id, extractors)
+            counts[outcome] = counts.get(outcome, 0) + 1
+            heartbeat(worker)
+        print(f"👷 {worker}: {counts}")
+    return counts
+
+
+def status():
+    with _db() as conn:
+        counts = dict(conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+        counts['unmerged'] = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state='done' AND merged=0").fetchone()[0]
+        rate, cooldown = conn.execute("SELECT rate, cooldown_until FROM budget WHERE id = 1").fetchone()
+    counts['rate_per_min'] = round(rate * 60, 2)
+    counts['cooldown_s'] = max(0, round(cooldown - time.time()))
+    return counts
+
+
+def merge_results():
+    """Upsert every finished, not-yet-merged result into the store (one writer, one pass)."""
+    import pandas as pd
+
+    import dataset_store
+    import freshness
+    import season_facts
+
+    with _db() as conn:
+        rows = conn.execute(
+            "SELECT player_id, result, updated_at FROM jobs WHERE state='done' AND merged=0").fetchall()
+    if not rows:
+        return 0
+
+    records, seasons, fetched = [], [], {}
+    for player_id, result, _ in rows:
+        result = json.loads(result)
+        records.append({**result['record'], 'Player_ID': player_id})
+        seasons.extend(result['seasons'])
+        if result.get('fetched_at') is not None:
+            fetched[player_id] = result['fetched_at']
+    dataset_store.upsert(pd.DataFrame(records))
+    season_facts.save_seasons(seasons)
+    # From the workers' results, not this host's cache, which may never have seen the pages
+    last_seasons = freshness.last_seasons(seasons)
+    freshness.record(list(fetched), last_seasons, fetched)
+    # Results from before fetched_at was kept: only the local cache can tell
+    freshness.record([pid for pid, _, _ in rows if pid not in fetched], last_seasons)
+
+    with _db() as conn, _txn(conn):
+        # A player completed again since the SELECT has a newer result waiting; leave it for next time
+        conn.executemany("UPDATE jobs SET merged=1 WHERE player_id=? AND updated_at=?",
+                         [(pid, updated_at) for pid, _, updated_at in rows])
+    return len(rows)
@@ -0,0 +1,232 @@
+import argparse
+import sys
+
+# === wr: one command line for the whole pipeline ===
+#   python wr.py draft 2013 2022          ingest drafts, add that range's WRs to the dataset
+#   python wr.py enrich [--limit 10]      scrape + extract everyone due a refresh
+#   python wr.py schedule                 who's due, active first; retired careers never
+#   python wr.py refresh                  in season: store only the current-season rows that moved
+#   python wr.py score [--changed]        rescore whatever changed, every model
+#   python wr.py inspect HopkDe00         what the extractors see on a cached page
+#   python wr.py queue add|work|status|merge   share one scrape across processes/hosts
+#   python wr.py archive build|verify|compact pages.warc.zst   pack the cache into a zstd archive
+# Every subcommand imports what it needs when it runs, so `inspect` never pays
+# for pandas / pyarrow / requests and answers from the cache in well under 200 ms.
+
+
+def cmd_draft(args):
+    import dataset_store
+    import draft_ingest
+
+    draft_ingest.ingest(args.start_year, args.end_year)
+    picks = draft_ingest.select(args.positions, args.start_year, args.end_year,
+                                columns=['Year', 'Player', 'Player_ID', 'College', 'Pick', 'Round', 'Team'])
+    picks = picks[picks['Player_ID'].notna()].drop(columns='Pos')
+    for year, count in picks.groupby('Year').size().items():
+        print(f"  {'/'.join(args.positions)} in {year}: {count}")
+    dataset_store.upsert(picks)
+    print(f"✅ {len(picks)} players in {dataset_store.path()}")
+
+
+def cmd_enrich(args):
+    import pipeline
+
+    if args.offline:
+        import page_cache
+        page_cache.OFFLINE = True
+    pipeline.enrich(args.player_ids, limit=args.limit, force=args.force,
+                    extractors=args.only, fetch=not args.offline)
+
+
+def cmd_schedule(args):
+    import freshness
+
+    df = freshness.schedule(args.force)
+    print(f"🗓️ {'In season' if freshness.in_season() else 'Offseason'}: "
+          + ", ".join(f"{n} {status}" for status, n in df['Status'].value_counts().items()))
+    due = df[df['Due']].astype({'Last_Season': float})   # NA -> NaN for _cell
+    print(f"⏰ {len(due)} due now" + (":" if len(due) else ""))
+    for row in due.head(args.limit).itertuples():
+        print(f"   {row.Player_ID:10s} {row.Status:8s} last season {_cell(row.Last_Season, 4)}")
+    if len(due) > args.limit:
+        print(f"   … and {len(due) - args.limit} more")
+
+
+def cmd_refresh(args):
+    import pipeline
+
+    if args.offline:
+        import page_cache
+        page_cache.OFFLINE = True
+    pipeline.refresh_season(args.player_ids, season=args.season, fetch=not args.offline)
+
+
+def cmd_score(args):
+    import dataset_store
+    import scoring
+
+    player_ids = None
+    if args.changed:
+        import pipeline
+        player_ids = pipeline.pending_changes()
+        print(f"📝 {len(player_ids)} players on the change list")
+    for name, count in scoring.rescore(args.models, player_ids=player_ids).items():
+        print(f"🧮 {name}: rescored {count} players")
+    if args.changed:
+        pipeline.clear_changes()
+    print(f"✅ Scores up to date in {dataset_store.path('scores')}")
+
+
+def cmd_queue(args):
+    import work_queue
+
+    if args.action == 'add':
+        import pipeline
+        added = work_queue.enqueue(pipeline.pending_players(args.force, args.player_ids), force=args.force)
+        print(f"📥 Queued {added} players in {work_queue.QUEUE_DB}")
+    elif args.action == 'work':
+        work_queue.run_worker(args.worker, extractors=args.only, batch=args.batch)
+    elif args.action == 'merge':
+        print(f"✅ Merged {work_queue.merge_results()} players into the dataset")
+    else:
+        print(f"📋 {work_queue.status()}")
+
+
+def cmd_archive(args):
+    import page_archive
+
+    mb = 1024 * 1024
+    if args.action == 'build':
+        stats = page_archive.build(args.path, kind=args.kind)
+    elif args.action == 'append':
+        stats = page_archive.append(args.path, kind=args.kind)
+    elif args.action == 'compact':
+        stats = page_archive.compact(args.path, keep=args.keep, retrain=not args.keep_dictionary)
+        print(f"🧹 {stats['dropped']} damaged records dropped"
+              + (f", plus {stats['unreadable_bytes'] / mb:.1f} MB unreadable after a damaged frame"
+                 if stats['unreadable_bytes'] else "")
+              + f", {stats['bytes_before'] / mb:.1f} MB -> {stats['archive_bytes'] / mb:.1f} MB")
+    else:
+        stats = page_archive.verify(args.path)
+        for offset, error in stats['bad']:
+            print(f"❌ offset {offset}: {error}")
+        if stats['gzip_records']:
+            print(f"🗜️ gzip cache holds {stats['gzip_records']} of these pages in {stats['gzip_bytes'] / mb:.1f} MB")
+        print(f"⏱️ {stats['us_per_record']} µs per record, {stats['mb_per_s']} MB/s decompressed")
+    print(f"📦 {args.path}: {stats['records']} records, {stats['raw_bytes'] / mb:.1f} MB raw, "
+          f"{stats['archive_bytes'] / mb:.1f} MB on disk "
+          f"({stats['archive_bytes'] / max(stats['raw_bytes'], 1):.1%})")
+    return 1 if stats.get('bad') else 0
+
+
+def _cell(value, width):
+    return f"{'' if value != value else int(value):>{width}}"   # NaN -> blank
+
+
+def cmd_inspect(args):
+    import time
+
+    import metrics
+    import page_cache
+
+    metrics.ENABLED = False   # a one-page look doesn't need a run report
+    url = page_cache.player_url(args.player_id)
+    if args.archive:
+        import page_archive
+        with page_archive.Archive(args.archive) as archive:
+            entry = archive.record(args.player_id)
+        html = entry and entry['html']
+    else:
+        entry = page_cache.lookup(url)
+        html = page_cache.get_cached(url, touch=False) if entry else None
+    if html is None:
+        where = args.archive or "the page cache"
+        print(f"❌ {args.player_id} isn't in {where} (python wr.py enrich {args.player_id})")
+        return 1
+
+    from player_page import PlayerPage, extract
+
+    page = PlayerPage(args.player_id, html)
+    record = extract(page, args.only)
+    fetched = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['fetched_at']))
+    print(f"📄 {url} (fetched {fetched}, parser {page.backend.name})")
+    for key, value in record.items():
+        print(f"   {key:16s} {value}")
+
+    cols = page.seasons()
+    if args.seasons and cols is not None:
+        print(f"   {'season':>6s} {'team':>5s} {'g':>3s} {'rec':>4s} {'yds':>5s} {'td':>3s} {'av':>3s}")
+        for i, season in enumerate(cols['season']):
+            cells = ' '.join(_cell(cols[stat][i], width) for stat, width in
+                             (('g', 3), ('rec', 4), ('rec_yds', 5), ('rec_td', 3), ('av', 3)))
+            print(f"   {season:>6d} {cols['team'][i]:>5s} {cells}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wr", description="WR draft scraper pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("draft", help="ingest draft classes and add a position group to the dataset")
+    p.add_argument("start_year", type=int, nargs="?", default=2013)
+    p.add_argument("end_year", type=int, nargs="?", default=2022)
+    p.add_argument("--positions", nargs="+", default=["WR"])
+    p.set_defaults(func=cmd_draft)
+
+    p = sub.add_parser("enrich", help="scrape and extract stats for players due a refresh")
+    p.add_argument("player_ids", nargs="*", help="just these players (default: everyone due)")
+    p.add_argument("--limit", type=int, help="stop after this many players")
+    p.add_argument("--force", action="store_true", help="rescrape everyone, retired players included")
+    p.add_argument("--only", nargs="*", help="run just these extractors")
+    p.add_argument("--offline", action="store_true", help="parse what's cached, fetch nothing")
+    p.set_defaults(func=cmd_enrich)
+
+    p = sub.add_parser("schedule", help="show each player's fetch status and who's due next")
+    p.add_argument("--force", action="store_true", help="as enrich --force would see it")
+    p.add_argument("--limit", type=int, default=20, help="due players to list")
+    p.set_defaults(func=cmd_schedule)
+
+    p = sub.add_parser("refresh", help="in-season delta: store only the current-season rows that changed")
+    p.add_argument("player_ids", nargs="*", help="just these players (default: active players due)")
+    p.add_argument("--season", type=int, help="season to compare (default: the current one)")
+    p.add_argument("--offline", action="store_true", help="compare what's cached, fetch nothing")
+    p.set_defaults(func=cmd_refresh)
+
+    p = sub.add_parser("score", help="rescore players whose inputs or models changed")
+    p.add_argument("--models", nargs="*", help="just these models (default: all)")
+    p.add_argument("--changed", action="store_true", help="only players on the refresh change list")
+    p.set_defaults(func=cmd_score)
+
+    p = sub.add_parser("inspect", help="show what the extractors read from a cached player page")
+    p.add_argument("player_id")
+    p.add_argument("--only", nargs="*", help="run just these extractors")
+    p.add_argument("--seasons", action="store_true", help="also print the season rows")
+    p.add_argument("--archive", help="read the page from this .warc.zst instead of the cache")
+    p.set_defaults(func=cmd_inspect)
+
+    p = sub.add_parser("queue", help="shared work queue: run as many `queue work` processes as you like")
+    p.add_argument("action", choices=["add", "work", "status", "merge"])
+    p.add_argument("player_ids", nargs="*", help="add: just these players (default: everyone due)")
+    p.add_argument("--force", action="store_true", help="add: everyone, requeuing players done or failed")
+    p.add_argument("--worker", help="work: lease owner name (default host:pid)")
+    p.add_argument("--batch", type=int, default=10, help="work: players leased at a time")
+    p.add_argument("--only", nargs="*", help="work: run just these extractors")
+    p.set_defaults(func=cmd_queue)
+
+    p = sub.add_parser("archive", help="pack cached pages into a dictionary-compressed .warc.zst archive")
+    p.add_argument("action", choices=["build", "append", "verify", "compact"])
+    p.add_argument("path", nargs="?", default="pages.warc.zst")
+    p.add_argument("--kind", default="player", help="build/append: page kind to pack ('player', 'draft', ...)")
+    p.add_argument("--keep", type=int, default=1, help="compact: revisions to keep per page")
+    p.add_argument("--keep-dictionary", action="store_true", help="compact: don't retrain the dictionary")
+    p.set_defaults(func=cmd_archive)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())